@@ -2,42 +2,158 @@
 """
 Setup script for the Data Cleaner desktop application.
 Run this to prepare everything for running the Electron app.
+
+Steps whose inputs (requirements, package manifests, frontend sources) and
+Python interpreter are unchanged since their last successful run, and whose
+outputs still exist, are skipped; pass --force to run everything. Independent
+installs run in parallel.
 """
 
+import hashlib
+import json
 import subprocess
 import sys
-import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+SCRIPT_DIR = Path(__file__).parent.absolute()
+PROJECT_ROOT = SCRIPT_DIR.parent
+WEB_DIR = PROJECT_ROOT / "web"
+FRONTEND_DIR = WEB_DIR / "frontend"
+BACKEND_DIR = WEB_DIR / "backend"
+
+CACHE_FILE = SCRIPT_DIR / ".setup-cache.json"
+
+# Each step is (name, cmd, cwd, hash_inputs, outputs). A step is only skipped
+# while all of its outputs exist (pip installs into the interpreter, which is
+# part of the cache key instead). Steps within a lane run in order;
+# lanes are independent of each other and run in parallel. The two pip installs
+# share a lane because concurrent pip runs into one environment can clash.
+LANES = [
+    [
+        (
+            "Installing Python package",
+            [sys.executable, "-m", "pip", "install", "-e", ".[dev]"],
+            PROJECT_ROOT,
+            [PROJECT_ROOT / "pyproject.toml"],
+            [],
+        ),
+        (
+            "Installing backend dependencies",
+            [sys.executable, "-m", "pip", "install", "-r", "requirements.txt"],
+            BACKEND_DIR,
+            [BACKEND_DIR / "requirements.txt"],
+            [],
+        ),
+    ],
+    [
+        (
+            "Installing frontend dependencies",
+            ["npm", "install"],
+            FRONTEND_DIR,
+            [FRONTEND_DIR / "package.json", FRONTEND_DIR / "package-lock.json"],
+            [FRONTEND_DIR / "node_modules"],
+        ),
+        (
+            "Building frontend",
+            ["npm", "run", "build"],
+            FRONTEND_DIR,
+            [
+                FRONTEND_DIR / "package.json",
+                FRONTEND_DIR / "package-lock.json",
+                FRONTEND_DIR / "index.html",
+                FRONTEND_DIR / "vite.config.ts",
+                FRONTEND_DIR / "tailwind.config.js",
+                FRONTEND_DIR / "postcss.config.js",
+                FRONTEND_DIR / "tsconfig.app.json",
+                FRONTEND_DIR / "src",
+                FRONTEND_DIR / "public",
+            ],
+            [FRONTEND_DIR / "dist"],
+        ),
+    ],
+    [
+        (
+            "Installing Electron dependencies",
+            ["npm", "install"],
+            SCRIPT_DIR,
+            [SCRIPT_DIR / "package.json"],
+            [SCRIPT_DIR / "node_modules"],
+        ),
+    ],
+]
+
+
+def hash_inputs(paths):
+    """
+    sha256 over the Python interpreter and the contents of `paths` (directories
+    are walked), in sorted order.
+    """
+    files = set()
+    for path in paths:
+        if path.is_dir():
+            files.update(p for p in path.rglob("*") if p.is_file())
+        elif path.is_file():
+            files.add(path)
+
+    digest = hashlib.sha256(sys.executable.encode())
+    for file in sorted(files):
+        digest.update(str(file.relative_to(PROJECT_ROOT)).encode())
+        digest.update(file.read_bytes())
+    return digest.hexdigest()
+
+
+def load_cache():
+    try:
+        return json.loads(CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache):
+    CACHE_FILE.write_text(json.dumps(cache, indent=2, sort_keys=True) + "\n")
+
+
 def run_command(cmd, cwd=None, description=None):
     """Run a command and print status."""
-    if description:
-        print(f"\n{'='*60}")
-        print(f"  {description}")
-        print('='*60)
-    
-    print(f"Running: {' '.join(cmd)}")
-    result = subprocess.run(cmd, cwd=cwd)
-    
+    # Output is captured so parallel steps don't interleave; it is shown on failure.
+    result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
+
     if result.returncode != 0:
-        print(f"❌ Command failed with code {result.returncode}")
+        print(f"❌ {description or ' '.join(cmd)} failed with code {result.returncode}")
+        print(result.stdout, end="")
+        print(result.stderr, end="", file=sys.stderr)
         return False
-    
-    print("✅ Done")
+
+    print(f"✅ {description or ' '.join(cmd)}")
     return True
 
+
+def run_lane(lane, cache, force=False):
+    """Run a lane's steps in order, skipping up-to-date ones. Returns False on failure."""
+    for name, cmd, cwd, inputs, outputs in lane:
+        digest = hash_inputs(inputs)
+        built = all(path.exists() for path in outputs)
+        if not force and built and cache.get(name) == digest:
+            print(f"⏭️  {name} (up to date)")
+            continue
+
+        print(f"▶️  {name}: {' '.join(cmd)}")
+        if not run_command(cmd, cwd=cwd, description=name):
+            # A failed step must rerun next time, even if its inputs are unchanged.
+            cache.pop(name, None)
+            return False
+        cache[name] = digest
+    return True
+
+
 def main():
-    # Get paths
-    script_dir = Path(__file__).parent.absolute()
-    project_root = script_dir.parent
-    web_dir = project_root / "web"
-    frontend_dir = web_dir / "frontend"
-    backend_dir = web_dir / "backend"
-    
+    force = "--force" in sys.argv[1:]
+
     print("="*60)
     print("  Data Cleaner Desktop App Setup")
     print("="*60)
-    
+
     # Check Python
     print("\n🐍 Checking Python...")
     try:
@@ -46,7 +162,7 @@ def main():
     except Exception as e:
         print(f"❌ Python not found: {e}")
         return 1
-    
+
     # Check Node.js
     print("\n📦 Checking Node.js...")
     try:
@@ -55,54 +171,32 @@ def main():
     except Exception:
         print("❌ Node.js not found. Please install from https://nodejs.org")
         return 1
-    
-    # Install Python dependencies
-    if not run_command(
-        [sys.executable, "-m", "pip", "install", "-e", ".[dev]"],
-        cwd=project_root,
-        description="Installing Python package"
-    ):
-        return 1
-    
-    if not run_command(
-        [sys.executable, "-m", "pip", "install", "-r", "requirements.txt"],
-        cwd=backend_dir,
-        description="Installing backend dependencies"
-    ):
-        return 1
-    
-    # Install frontend dependencies
-    if not run_command(
-        ["npm", "install"],
-        cwd=frontend_dir,
-        description="Installing frontend dependencies"
-    ):
-        return 1
-    
-    # Build frontend
-    if not run_command(
-        ["npm", "run", "build"],
-        cwd=frontend_dir,
-        description="Building frontend"
-    ):
-        return 1
-    
-    # Install Electron dependencies
-    if not run_command(
-        ["npm", "install"],
-        cwd=script_dir,
-        description="Installing Electron dependencies"
-    ):
+
+    # Install dependencies and build the frontend
+    print("\n🔧 Installing dependencies...")
+    cache = load_cache()
+    ok = True
+    with ThreadPoolExecutor(max_workers=len(LANES)) as pool:
+        futures = [pool.submit(run_lane, lane, cache, force) for lane in LANES]
+        for future in as_completed(futures):
+            if not future.result():
+                # Fail fast: lanes that haven't started are dropped; running
+                # ones finish so their results can still be cached.
+                ok = False
+                for other in futures:
+                    other.cancel()
+    save_cache(cache)
+    if not ok:
         return 1
-    
+
     print("\n" + "="*60)
     print("  ✅ Setup Complete!")
     print("="*60)
     print("\nTo run the desktop app:")
-    print(f"  cd {script_dir}")
+    print(f"  cd {SCRIPT_DIR}")
     print("  npm start")
     print()
-    
+
     return 0
 
 if __name__ == "__main__":
@@ -4,10 +4,27 @@ data_cleaning
 Small library for cleaning production datasets for analysis.
 """
 
-from .app import run_cleaning_job
-from .cleaner import DataCleaner
-from .config import DataCleaningConfig
-from .io import read_input_file, write_output_file
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .app import run_cleaning_job, run_cleaning_job_streaming
+    from .cleaner import DataCleaner
+    from .config import DataCleaningConfig
+    from .io import read_input_file, write_output_file
+
+# Public names -> defining submodule. Loaded on first access (PEP 562) so that
+# importing the package, e.g. for the CLI entry point, doesn't import pandas.
+_EXPORTS = {
+    "DataCleaner": ".cleaner",
+    "DataCleaningConfig": ".config",
+    "read_input_file": ".io",
+    "write_output_file": ".io",
+    "run_cleaning_job": ".app",
+    "run_cleaning_job_streaming": ".app",
+}
 
 __all__ = [
     "DataCleaner",
@@ -15,5 +32,17 @@ __all__ = [
     "read_input_file",
     "write_output_file",
     "run_cleaning_job",
+    "run_cleaning_job_streaming",
 ]
 
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        value = getattr(import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
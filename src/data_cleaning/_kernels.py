@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit, prange, types
+except ImportError:  # pragma: no cover - numba is an optional dependency
+    njit = None
+
+
+def _derive_numpy(
+    run_s: np.ndarray,
+    spindles: float,
+    shift_seconds: float,
+    eff_min: float,
+    eff_max: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    per_spindle_s = run_s / spindles
+    per_spindle_h = per_spindle_s / 3600.0
+    eff = run_s / (shift_seconds * spindles) * 100.0
+    mask = (eff >= eff_min) & (eff <= eff_max)
+    return per_spindle_s, per_spindle_h, eff, mask
+
+
+if njit is not None:
+    # Compiled eagerly (and cached on disk) so the JIT cost is paid once per install,
+    # not on the first clean() call. fastmath is left off so the efficiency bounds
+    # select exactly the same rows as the NumPy fallback.
+    _f8_in = types.Array(types.float64, 1, "C", readonly=True)
+    _f8_out = types.float64[::1]
+
+    @njit(
+        types.void(
+            _f8_in, types.float64, types.float64, types.float64, types.float64,
+            _f8_out, _f8_out, _f8_out, types.boolean[::1],
+        ),
+        parallel=True,
+        cache=True,
+    )
+    def _derive_kernel(run_s, spindles, shift_seconds, eff_min, eff_max,
+                       out_ps_s, out_ps_h, out_eff, out_mask):  # pragma: no cover - compiled
+        denom = shift_seconds * spindles
+        for i in prange(run_s.size):
+            r = run_s[i]
+            ps_s = r / spindles
+            eff = r / denom * 100.0
+            out_ps_s[i] = ps_s
+            out_ps_h[i] = ps_s / 3600.0
+            out_eff[i] = eff
+            out_mask[i] = eff >= eff_min and eff <= eff_max
+
+
+def derive_metrics(
+    run_s: np.ndarray,
+    *,
+    spindles: float,
+    shift_seconds: float,
+    eff_min: float,
+    eff_max: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-spindle seconds, per-spindle hours, efficiency (%) and the efficiency
+    range mask for an array of run-time seconds, computed in a single pass.
+    """
+    run_s = np.ascontiguousarray(run_s, dtype=np.float64)
+    if njit is None:
+        return _derive_numpy(run_s, spindles, shift_seconds, eff_min, eff_max)
+
+    n = run_s.size
+    out_ps_s = np.empty(n, dtype=np.float64)
+    out_ps_h = np.empty(n, dtype=np.float64)
+    out_eff = np.empty(n, dtype=np.float64)
+    out_mask = np.empty(n, dtype=np.bool_)
+    _derive_kernel(
+        run_s, float(spindles), float(shift_seconds), float(eff_min), float(eff_max),
+        out_ps_s, out_ps_h, out_eff, out_mask,
+    )
+    return out_ps_s, out_ps_h, out_eff, out_mask
@@ -2,9 +2,96 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import pandas as pd
+
 from .cleaner import DataCleaner
 from .config import DataCleaningConfig
-from .io import read_input_file, write_output_file
+from .io import (
+    BatchWriter,
+    input_schema,
+    iter_input_frames,
+    read_input_file,
+    write_output_file,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as pa_ds
+except ImportError:  # pragma: no cover - pyarrow is an optional dependency
+    pa = None
+    pa_ds = None
+
+
+def _raw_required_columns(config: DataCleaningConfig) -> set[str]:
+    """Columns the cleaner needs, under their raw names (including rename_map aliases)."""
+    required = {
+        config.col_date,
+        config.col_shift,
+        config.col_machine,
+        config.col_style,
+        config.col_runtime,
+        config.col_rpm,
+    }
+    rename_map = config.rename_map or {}
+    return required | {raw for raw, name in rename_map.items() if name in required}
+
+
+def _scan_plan(schema: "pa.Schema", config: DataCleaningConfig) -> tuple[list[str], str | None]:
+    """
+    Columns the cleaner needs from a file with `schema` (raw names, including
+    rename_map aliases), and the RPM column to filter on while scanning.
+    """
+    rename_map = config.rename_map or {}
+    wanted = _raw_required_columns(config)
+
+    # Absent columns are left out so the cleaner reports them as missing.
+    columns = [name for name in schema.names if name in wanted]
+
+    # Only a numeric RPM column can be compared while scanning; text columns
+    # are coerced (and filtered) by the cleaner instead.
+    rpm_fields = [f for f in schema if rename_map.get(f.name, f.name) == config.col_rpm]
+    rpm_column = None
+    if len(rpm_fields) == 1:
+        rpm = rpm_fields[0]
+        if pa.types.is_integer(rpm.type) or pa.types.is_floating(rpm.type):
+            rpm_column = rpm.name
+
+    return columns, rpm_column
+
+
+def _parquet_pushdown(path: Path, config: DataCleaningConfig) -> dict:
+    """
+    Reader kwargs that push the cleaner's RPM filter into a Parquet scan. Only
+    the file footer is read to build them. Columns are not projected, since
+    the cleaned output keeps every input column.
+    """
+    if pa is None:
+        return {}
+
+    _, rpm_column = _scan_plan(input_schema(path, fmt="parquet"), config)
+    if rpm_column is None:
+        return {}
+    return {"filters": [(rpm_column, "<=", config.rpm_max)]}
+
+
+def _feather_sidecar(path: Path) -> Path:
+    """Where the Feather copy of `path` is cached (`<input>.feather`)."""
+    return path.with_name(path.name + ".feather")
+
+
+def _write_sidecar(df: pd.DataFrame, sidecar: Path) -> None:
+    """
+    Cache a raw input frame as uncompressed Feather. Best effort: frames Arrow
+    can't represent (e.g. mixed-type Excel columns) are simply not cached.
+    """
+    tmp = sidecar.with_name(sidecar.name + ".tmp")
+    try:
+        write_output_file(df, tmp, fmt="feather")
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        tmp.unlink(missing_ok=True)
+        return
+    # Renamed into place so a crash never leaves a truncated cache behind.
+    tmp.replace(sidecar)
 
 
 def run_cleaning_job(
@@ -14,12 +101,99 @@ def run_cleaning_job(
     config: DataCleaningConfig | None = None,
     input_format: str | None = None,
     output_format: str | None = None,
-) -> None:
+    output_options: dict | None = None,
+    cache_feather: bool = False,
+) -> pd.DataFrame:
     """
-    Main "app" function: read file -> clean -> write file.
+    Main "app" function: read file -> clean -> write file. Returns the
+    cleaned DataFrame that was written.
+
+    `output_options` are forwarded to `write_output_file` (e.g. Parquet
+    compression settings).
+
+    With `cache_feather` (requires pyarrow), the raw csv/Excel input is also
+    saved as `<input>.feather`, and later runs memory-map that file instead
+    of parsing the input again, for as long as it is newer than the input.
+    Parquet inputs are not cached; they are already read column-wise.
+
+    With pyarrow installed, columns are read Arrow-backed (pd.ArrowDtype) and
+    stay that way through cleaning and writing. Parquet inputs are read with
+    rows above `rpm_max` skipped at scan time.
     """
-    df_raw = read_input_file(input_path, fmt=input_format)  # type: ignore[arg-type]
-    cleaner = DataCleaner(config=config)
+    cfg = config or DataCleaningConfig()
+    p = Path(input_path)
+    fmt = input_format or p.suffix.lower().lstrip(".")
+
+    read_kwargs = _parquet_pushdown(p, cfg) if fmt == "parquet" else {}
+    if pa is not None:
+        read_kwargs["dtype_backend"] = "pyarrow"
+
+    sidecar = None
+    if cache_feather and pa is not None and fmt not in ("parquet", "feather"):
+        sidecar = _feather_sidecar(p)
+    if sidecar is not None and sidecar.exists() and sidecar.stat().st_mtime >= p.stat().st_mtime:
+        df_raw = read_input_file(sidecar, fmt="feather", **read_kwargs)
+    else:
+        df_raw = read_input_file(p, fmt=input_format, **read_kwargs)  # type: ignore[arg-type]
+        if sidecar is not None:
+            _write_sidecar(df_raw, sidecar)
+
+    cleaner = DataCleaner(config=cfg)
     df_clean = cleaner.clean(df_raw)
-    write_output_file(df_clean, output_path, fmt=output_format)  # type: ignore[arg-type]
+    write_output_file(df_clean, output_path, fmt=output_format, **(output_options or {}))  # type: ignore[arg-type]
+    return df_clean
+
+
+def run_cleaning_job_streaming(
+    input_path: str | Path,
+    output_path: str | Path,
+    *,
+    config: DataCleaningConfig | None = None,
+    input_format: str | None = None,
+    output_format: str | None = None,
+    output_options: dict | None = None,
+    batch_rows: int = 65_536,
+) -> None:
+    """
+    Like `run_cleaning_job`, but reads, cleans and writes `batch_rows` rows at
+    a time so peak memory follows the batch size rather than the file size.
+
+    csv, parquet and feather only (requires pyarrow). Only the required columns are
+    read, and for parquet and feather, rows above `rpm_max` are skipped while
+    scanning (CSV columns are read as text for the cleaner to coerce). When multi-style
+    shifts are dropped, the input is scanned twice: a shift can span batches,
+    so its styles are collected over the whole file first.
+    """
+    cfg = config or DataCleaningConfig()
+    cleaner = DataCleaner(config=cfg)
+
+    # CSV types would be inferred from the first block only, so one dirty cell
+    # further down would fail the scan; the cleaner coerces these columns and
+    # drops the rows that don't parse instead.
+    text_columns = sorted(_raw_required_columns(cfg))
+    schema = input_schema(input_path, fmt=input_format, text_columns=text_columns)  # type: ignore[arg-type]
+    columns, rpm_column = _scan_plan(schema, cfg)
+    scan_filter = None
+    if rpm_column is not None:
+        scan_filter = pa_ds.field(rpm_column) <= cfg.rpm_max
+
+    def frames():
+        return iter_input_frames(
+            input_path,
+            fmt=input_format,  # type: ignore[arg-type]
+            columns=columns,
+            filter=scan_filter,
+            batch_rows=batch_rows,
+            dtype_backend="pyarrow",
+            text_columns=text_columns,
+        )
+
+    multi_style_shifts = None
+    if cfg.drop_multi_style_shifts:
+        shift_styles = pd.concat([cleaner.shift_styles(df) for df in frames()])
+        multi_style_shifts = cleaner.multi_style_shifts(shift_styles.drop_duplicates())
 
+    clean = cleaner.compile()
+    with BatchWriter(output_path, fmt=output_format, **(output_options or {})) as writer:  # type: ignore[arg-type]
+        for df in frames():
+            writer.write(clean(df, multi_style_shifts=multi_style_shifts))
@@ -1,74 +1,317 @@
 from __future__ import annotations
 
+from collections.abc import Callable
+from datetime import datetime
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
 import pandas as pd
 
-from .config import DataCleaningConfig
+from ._kernels import derive_metrics
+from .config import DERIVED_COLUMNS, DataCleaningConfig
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover - pyarrow is an optional dependency
+    pa = None
+    pc = None
+
+
+# pandas < 3 parses text dates at nanosecond resolution, so dates outside
+# 1677-2262 come out NaT there.
+_NS_TEXT_DATES = int(pd.__version__.split(".")[0]) < 3
+
+# "H:MM:SS" / "HHH:MM:SS(.fff)" run times, the layout production exports use.
+_HMS_PATTERN = r"^\s*(?P<h>\d+):(?P<m>[0-5]?\d):(?P<s>[0-5]?\d(?:\.\d+)?)\s*$"
+
+
+def _hms_seconds(text: pd.Series) -> np.ndarray:
+    """Seconds for cells matching `_HMS_PATTERN`, NaN elsewhere."""
+    if pc is not None:
+        parts = pc.extract_regex(pa.array(text, type=pa.string(), from_pandas=True), _HMS_PATTERN)
+        h, m, s = (pc.cast(pc.struct_field(parts, k), pa.float64()) for k in ("h", "m", "s"))
+        seconds = pc.add(pc.add(pc.multiply(h, 3600.0), pc.multiply(m, 60.0)), s)
+        return seconds.to_numpy(zero_copy_only=False)
+
+    parts = text.str.extract(_HMS_PATTERN).astype("float64")
+    return (parts["h"] * 3600.0 + parts["m"] * 60.0 + parts["s"]).to_numpy()
+
+
+def _parse_out_of_range(text: pd.Series, parsed: pd.Series, date_format: str | None) -> pd.Series:
+    """
+    `parsed` (the datetime64[s] parse of `text`) with the dates pandas < 3
+    left NaT for being outside the nanosecond range parsed at second
+    resolution instead, one distinct value at a time.
+    """
+    missing = parsed.isna().to_numpy() & text.notna().to_numpy()
+    if not _NS_TEXT_DATES or not missing.any():
+        return parsed
+
+    found = {}
+    for value in pd.unique(text[missing]):
+        try:
+            stamp = pd.Timestamp(value if date_format is None else datetime.strptime(value, date_format))
+        except (TypeError, ValueError, OverflowError):
+            continue
+        # Values pandas rejected for other reasons stay NaT
+        if stamp is not pd.NaT and not pd.Timestamp.min <= stamp <= pd.Timestamp.max:
+            found[value] = stamp.to_datetime64()
+    if not found:
+        return parsed
+
+    # Position -1 (not found) picks the trailing NaT
+    lookup = np.array([*found.values(), None], dtype="datetime64[s]")
+    values = parsed.to_numpy(dtype="datetime64[s]", copy=True)
+    values[missing] = lookup[pd.Index(list(found)).get_indexer(text[missing])]
+    return pd.Series(values, index=parsed.index, name=parsed.name)
+
+
+def _parse_dates(dates: pd.Series, date_format: str | None = None) -> pd.Series:
+    """
+    Convert a date column to datetime64[s] (NaT when unparseable).
+
+    Second resolution covers production dates whatever unit they were read
+    with, and spans years far outside the 1677-2262 range of nanoseconds.
+    With a `date_format`, text dates are dictionary-encoded and only the
+    distinct values are parsed, by Arrow's strptime kernel, instead of pandas
+    inferring the format per value.
+    """
+    is_text = pd.api.types.is_object_dtype(dates) or pd.api.types.is_string_dtype(dates)
+    if date_format is None or not is_text:
+        parsed = pd.to_datetime(dates, errors="coerce").dt.as_unit("s")
+        return _parse_out_of_range(dates, parsed, None) if is_text else parsed
+    if pc is None:
+        parsed = pd.to_datetime(dates, format=date_format, errors="coerce", cache=True).dt.as_unit("s")
+        return _parse_out_of_range(dates, parsed, date_format)
+
+    encoded = pa.array(dates, type=pa.string(), from_pandas=True).dictionary_encode()
+    values = encoded.dictionary
+    parsed = pc.strptime(values, format=date_format, unit="s", error_is_null=True)
+
+    # strptime rolls impossible dates over (Feb 30 -> Mar 1); values that don't
+    # format back to themselves are left to pandas, which rejects those.
+    exact = pc.fill_null(pc.equal(pc.strftime(parsed, format=date_format), values), False)
+    parsed = parsed.to_numpy(zero_copy_only=False, writable=True)
+    rest = ~exact.to_numpy(zero_copy_only=False)
+    if rest.any():
+        text = values.filter(pa.array(rest)).to_pandas()
+        rest_parsed = pd.to_datetime(text, format=date_format, errors="coerce").dt.as_unit("s")
+        parsed[rest] = _parse_out_of_range(text, rest_parsed, date_format).to_numpy(dtype="datetime64[s]")
+
+    datetimes = pa.array(parsed, type=pa.timestamp("s")).take(encoded.indices)
+    return pd.Series(datetimes.to_numpy(zero_copy_only=False), index=dates.index, name=dates.name)
+
+
+def _runtime_seconds(runtime: pd.Series) -> pd.Series:
+    """
+    Convert a run-time column to float seconds (NaN when unparseable).
+
+    Text cells in "H:MM:SS" form are split and summed with vectorized kernels;
+    anything else goes through `pd.to_timedelta`.
+    """
+    if not (pd.api.types.is_object_dtype(runtime) or pd.api.types.is_string_dtype(runtime)):
+        return pd.to_timedelta(runtime.astype("string"), errors="coerce").dt.total_seconds()
+
+    # Arrow-backed string columns are handed to the kernels as they are.
+    text = runtime if isinstance(runtime.dtype, pd.ArrowDtype) else runtime.astype("string")
+    seconds = pd.Series(_hms_seconds(text), index=runtime.index, dtype="float64")
+
+    rest = seconds.isna().to_numpy() & text.notna().to_numpy(dtype=bool)
+    if rest.any():
+        seconds[rest] = pd.to_timedelta(text[rest], errors="coerce").dt.total_seconds()
+    return seconds
+
+
+class _CleanPlan(NamedTuple):
+    """Everything `DataCleaner` reads from its config, resolved once per config."""
+
+    rename_map: dict[str, str]
+    required: frozenset[str]
+    keys: list[str]
+    col_date: str
+    col_style: str
+    col_runtime: str
+    col_rpm: str
+    categorical: tuple[str, ...]
+    date_format: str | None
+    rpm_max: float
+    drop_multi_style_shifts: bool
+    spindles: float
+    shift_seconds: float
+    eff_min: float
+    eff_max: float
+    output_columns: tuple[str, ...]
+
+
+@lru_cache(maxsize=32)
+def _plan(config: DataCleaningConfig) -> _CleanPlan:
+    keys = [config.col_date, config.col_shift, config.col_machine]
+    return _CleanPlan(
+        rename_map=config.rename_map or {},
+        required=frozenset({*keys, config.col_style, config.col_runtime, config.col_rpm}),
+        keys=keys,
+        col_date=config.col_date,
+        col_style=config.col_style,
+        col_runtime=config.col_runtime,
+        col_rpm=config.col_rpm,
+        categorical=(config.col_shift, config.col_machine, config.col_style),
+        date_format=config.date_format,
+        rpm_max=config.rpm_max,
+        drop_multi_style_shifts=config.drop_multi_style_shifts,
+        spindles=float(config.spindles_per_side),
+        shift_seconds=float(config.shift_hours) * 3600.0,
+        eff_min=config.efficiency_min,
+        eff_max=config.efficiency_max,
+        output_columns=tuple(
+            name
+            for name in DERIVED_COLUMNS
+            if config.output_columns is None or name in config.output_columns
+        ),
+    )
 
 
 class DataCleaner:
     def __init__(self, config: DataCleaningConfig | None = None):
         self.config = config or DataCleaningConfig()
 
-    def clean(self, df_raw: pd.DataFrame) -> pd.DataFrame:
+    def _prepare(self, df_raw: pd.DataFrame, plan: _CleanPlan) -> tuple[pd.DataFrame, np.ndarray]:
         """
-        Clean and prepare production data for analysis.
+        Steps 1-4: rename, validate, coerce types and drop unusable rows.
 
-        Returns a new DataFrame (does not mutate the input).
+        Returns the kept rows and their run times in seconds; the run times
+        are not stored on the frame.
         """
-        df = df_raw.copy()
-
-        # 1) Rename columns (handles embedded newlines)
-        df = df.rename(columns=self.config.rename_map or {})
+        # 1) Rename columns (handles embedded newlines). rename/assign return new
+        # frames, so the input is never written to and needs no upfront copy.
+        df = df_raw.rename(columns=plan.rename_map)
 
         # 2) Validate required columns exist
-        required = {
-            self.config.col_date,
-            self.config.col_shift,
-            self.config.col_machine,
-            self.config.col_style,
-            self.config.col_runtime,
-            self.config.col_rpm,
-        }
-        missing = required - set(df.columns)
+        missing = plan.required - set(df.columns)
         if missing:
             raise KeyError(f"Missing required columns: {sorted(missing)}")
 
-        # 3) Coerce types
-        df[self.config.col_date] = pd.to_datetime(df[self.config.col_date], errors="coerce")
-        df[self.config.col_rpm] = pd.to_numeric(df[self.config.col_rpm], errors="coerce")
+        # 3) Coerce types. The low-cardinality key columns become categoricals so
+        # later groupby/dedup steps hash small integer codes rather than strings.
+        rpm = df[plan.col_rpm]
+        if not pd.api.types.is_numeric_dtype(rpm):
+            rpm = pd.to_numeric(rpm, errors="coerce")
+        df = df.assign(**{
+            plan.col_date: _parse_dates(df[plan.col_date], plan.date_format),
+            plan.col_rpm: rpm,
+            **{col: df[col].astype("category") for col in plan.categorical},
+        })
+        run_s = _runtime_seconds(df[plan.col_runtime]).to_numpy(dtype="float64")
 
-        run_td = pd.to_timedelta(df[self.config.col_runtime].astype("string"), errors="coerce")
-        df["Run_time_seconds"] = run_td.dt.total_seconds()
+        # Drop unusable rows, and 4) filter RPM outliers. NumPy columns are
+        # compared in place; missing RPMs (NaN) fail the comparison.
+        if isinstance(rpm.dtype, np.dtype):
+            rpm_values = rpm.to_numpy()
+        else:
+            rpm_values = rpm.to_numpy(dtype=np.float64, na_value=np.nan)
+        keep = (
+            df[plan.col_date].notna().to_numpy()
+            & ~np.isnan(run_s)
+            & (rpm_values <= plan.rpm_max)
+        )
+        rows = np.flatnonzero(keep)
+        return df.iloc[rows], run_s[rows]
 
-        # Drop unusable rows
-        df = df.dropna(subset=[self.config.col_date, self.config.col_rpm, "Run_time_seconds"])
+    def shift_styles(self, df_raw: pd.DataFrame) -> pd.DataFrame:
+        """
+        Distinct (date, shift, machine, style) rows among the rows that reach
+        the multi-style step of `clean`.
 
-        # 4) Filter RPM outliers
-        df = df.loc[df[self.config.col_rpm] <= self.config.rpm_max].copy()
+        Used to find multi-style shifts across data that is cleaned in chunks;
+        see `multi_style_shifts`.
+        """
+        plan = _plan(self.config)
+        df, _ = self._prepare(df_raw, plan)
+        return df[[*plan.keys, plan.col_style]].drop_duplicates()
 
-        # 5) Optionally remove multi-style (Date, Shift, Machine) groups
-        if self.config.drop_multi_style_shifts:
-            keys = [self.config.col_date, self.config.col_shift, self.config.col_machine]
-            style_counts = df.groupby(keys, dropna=False)[self.config.col_style].nunique()
-            bad_keys = style_counts[style_counts > 1].index
-            df = df.loc[~df.set_index(keys).index.isin(bad_keys)].copy()
+    def multi_style_shifts(self, shift_styles: pd.DataFrame) -> pd.MultiIndex:
+        """(date, shift, machine) keys that ran more than one style."""
+        plan = _plan(self.config)
+        style_counts = shift_styles.groupby(plan.keys, dropna=False, observed=True)[
+            plan.col_style
+        ].nunique()
+        return style_counts[style_counts > 1].index
 
-        # 6) Derived metrics
-        total_shift_seconds = float(self.config.shift_hours) * 3600.0
-        spindles = float(self.config.spindles_per_side)
+    def clean(
+        self,
+        df_raw: pd.DataFrame,
+        *,
+        multi_style_shifts: pd.MultiIndex | None = None,
+    ) -> pd.DataFrame:
+        """
+        Clean and prepare production data for analysis.
 
-        df["Run_time_per_spindle_seconds"] = df["Run_time_seconds"] / spindles
-        df["Run_time_per_spindle_hours"] = df["Run_time_per_spindle_seconds"] / 3600.0
-        df["Machine_Efficiency"] = (
-            df["Run_time_seconds"] / (total_shift_seconds * spindles) * 100.0
-        )
+        `multi_style_shifts` overrides the (date, shift, machine) keys dropped
+        by the multi-style step, for callers that clean a file chunk by chunk
+        and found those keys over the whole file up front.
 
-        # 7) Efficiency range filter
-        df = df.loc[
-            df["Machine_Efficiency"].between(
-                self.config.efficiency_min, self.config.efficiency_max
-            )
-        ].copy()
+        Returns a new DataFrame (does not mutate the input).
+        """
+        return self._clean(df_raw, _plan(self.config), multi_style_shifts)
+
+    def compile(self) -> Callable[..., pd.DataFrame]:
+        """
+        `clean` bound to the current config, for callers that clean many
+        frames with one cleaner (e.g. batch by batch). The config is resolved
+        once here; later changes to `self.config` do not affect the result.
+        """
+        plan = _plan(self.config)
+
+        def clean(df_raw: pd.DataFrame, *, multi_style_shifts: pd.MultiIndex | None = None) -> pd.DataFrame:
+            return self._clean(df_raw, plan, multi_style_shifts)
+
+        return clean
 
-        return df
+    def _clean(
+        self,
+        df_raw: pd.DataFrame,
+        plan: _CleanPlan,
+        multi_style_shifts: pd.MultiIndex | None,
+    ) -> pd.DataFrame:
+        # Rows are selected in two stages: the cheap validity/RPM mask first (in
+        # _prepare), then the multi-style and efficiency masks combined into a
+        # single selection.
+        df, run_s = self._prepare(df_raw, plan)
 
+        # 5) Optionally flag multi-style (Date, Shift, Machine) groups
+        keep = np.ones(len(df), dtype=bool)
+        if plan.drop_multi_style_shifts:
+            if multi_style_shifts is not None:
+                keep = ~pd.MultiIndex.from_frame(df[plan.keys]).isin(multi_style_shifts)
+            else:
+                n_styles = df.groupby(plan.keys, dropna=False, sort=False, observed=True)[
+                    plan.col_style
+                ].transform("nunique")
+                keep = n_styles.to_numpy() <= 1
+
+        # 6) Derived metrics
+        ps_s, ps_h, eff, in_range = derive_metrics(
+            run_s,
+            spindles=plan.spindles,
+            shift_seconds=plan.shift_seconds,
+            eff_min=plan.eff_min,
+            eff_max=plan.eff_max,
+        )
+
+        # 7) Efficiency range filter, then store only the requested columns
+        rows = np.flatnonzero(keep & in_range)
+        df = df.iloc[rows]
+        if not plan.output_columns:
+            return df
+
+        # The derived columns are gathered into one 2-D array so they form a
+        # single float64 block, rather than one block per column.
+        derived = dict(zip(DERIVED_COLUMNS, (run_s, ps_s, ps_h, eff)))
+        block = np.empty((len(plan.output_columns), rows.size), dtype=np.float64)
+        for out, name in zip(block, plan.output_columns):
+            np.take(derived[name], rows, out=out)
+        derived_df = pd.DataFrame(
+            block.T, index=df.index, columns=list(plan.output_columns), copy=False
+        )
+        return pd.concat([df, derived_df], axis=1)
@@ -1,34 +1,94 @@
 from __future__ import annotations
 
 import argparse
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-from .app import run_cleaning_job
-from .config import DataCleaningConfig
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="data-clean", description="Clean production data for analysis.")
-    p.add_argument("input", help="Input file path (.csv/.xlsx/.parquet)")
-    p.add_argument("output", help="Output file path (.csv/.xlsx/.parquet)")
+    p.add_argument("input", help="Input file path (.csv/.xlsx/.parquet/.feather)")
+    p.add_argument("output", help="Output file path (.csv/.xlsx/.parquet/.feather)")
 
-    p.add_argument("--input-format", default=None, help="Override input format (csv/xlsx/xls/parquet)")
-    p.add_argument("--output-format", default=None, help="Override output format (csv/xlsx/xls/parquet)")
+    p.add_argument("--input-format", default=None, help="Override input format (csv/xlsx/xls/parquet/feather)")
+    p.add_argument("--output-format", default=None, help="Override output format (csv/xlsx/xls/parquet/feather)")
 
     p.add_argument("--rpm-max", type=float, default=10_000)
     p.add_argument("--eff-min", type=float, default=75.0)
     p.add_argument("--eff-max", type=float, default=100.0)
     p.add_argument("--spindles", type=int, default=84)
     p.add_argument("--shift-hours", type=float, default=8.0)
+    p.add_argument(
+        "--date-format",
+        default=None,
+        help='strptime format of the Date column, e.g. "%%Y-%%m-%%d" (default: inferred).',
+    )
     p.add_argument(
         "--keep-multi-style-shifts",
         action="store_true",
         help="Do not drop shifts where >1 style ran on same (date, shift, machine).",
     )
+    p.add_argument(
+        "--parquet-compression",
+        default=None,
+        choices=["zstd", "snappy", "gzip", "brotli", "lz4", "none"],
+        help="Parquet output codec (default: zstd).",
+    )
+    p.add_argument(
+        "--parquet-compression-level",
+        type=int,
+        default=None,
+        help="Parquet codec level (default: 3 for zstd).",
+    )
+    p.add_argument(
+        "--parquet-row-group-size",
+        type=int,
+        default=None,
+        help="Rows per Parquet row group (default: 262144).",
+    )
+    p.add_argument(
+        "--cache-feather",
+        action="store_true",
+        help="Cache the parsed csv/Excel input as <input>.feather and reuse it on later runs (requires pyarrow).",
+    )
+    p.add_argument(
+        "--streaming",
+        action="store_true",
+        help=(
+            "Clean csv/parquet/feather files in batches to bound memory use, writing csv or parquet "
+            "(requires pyarrow). Only the columns the cleaner needs are read, so other input "
+            "columns are dropped from the output."
+        ),
+    )
     return p
 
 
-def main(argv: list[str] | None = None) -> int:
-    args = build_parser().parse_args(argv)
+def _output_options(args: argparse.Namespace) -> dict:
+    return {
+        name: value
+        for name, value in (
+            ("compression", args.parquet_compression),
+            ("compression_level", args.parquet_compression_level),
+            ("row_group_size", args.parquet_row_group_size),
+        )
+        if value is not None
+    }
+
+
+def run(args: argparse.Namespace) -> pd.DataFrame | None:
+    """
+    Run the cleaning job described by parsed `args` (see `build_parser`).
+
+    Returns the cleaned DataFrame, or None with --streaming, where the
+    output is only ever written batch by batch.
+    """
+    # Imported here rather than at module level: they pull in pandas/pyarrow,
+    # which --help and usage errors shouldn't have to wait for.
+    from .app import run_cleaning_job, run_cleaning_job_streaming
+    from .config import DataCleaningConfig
 
     cfg = DataCleaningConfig(
         rpm_max=args.rpm_max,
@@ -36,16 +96,38 @@ def main(argv: list[str] | None = None) -> int:
         efficiency_max=args.eff_max,
         spindles_per_side=args.spindles,
         shift_hours=args.shift_hours,
+        date_format=args.date_format,
         drop_multi_style_shifts=not args.keep_multi_style_shifts,
     )
 
-    run_cleaning_job(
-        args.input,
-        args.output,
+    job_kwargs = dict(
         config=cfg,
         input_format=args.input_format,
         output_format=args.output_format,
+        output_options=_output_options(args),
     )
+    if args.streaming:
+        run_cleaning_job_streaming(args.input, args.output, **job_kwargs)
+        return None
+    return run_cleaning_job(args.input, args.output, cache_feather=args.cache_feather, **job_kwargs)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    output_fmt = args.output_format or Path(args.output).suffix.lower().lstrip(".")
+    if _output_options(args) and output_fmt != "parquet":
+        parser.error("--parquet-* options require parquet output")
+    if args.cache_feather and args.streaming:
+        parser.error("--cache-feather cannot be combined with --streaming")
+    input_fmt = args.input_format or Path(args.input).suffix.lower().lstrip(".")
+    if args.streaming and input_fmt not in ("csv", "parquet", "feather"):
+        parser.error("--streaming requires csv, parquet or feather input")
+    if args.streaming and output_fmt not in ("csv", "parquet"):
+        parser.error("--streaming requires csv or parquet output")
+
+    run(args)
     return 0
 
 
@@ -1,6 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+# Columns DataCleaner.clean derives from the run time, in output order.
+DERIVED_COLUMNS = (
+    "Run_time_seconds",
+    "Run_time_per_spindle_seconds",
+    "Run_time_per_spindle_hours",
+    "Machine_Efficiency",
+)
 
 
 @dataclass(frozen=True)
@@ -20,10 +28,27 @@ class DataCleaningConfig:
     col_runtime: str = "Run_time"
     col_rpm: str = "RPM"
 
+    # strptime format of text dates (e.g. "%Y-%m-%d"). When set, dates are parsed
+    # with that one format instead of being inferred; non-matching cells become NaT.
+    date_format: str | None = None
+
     # Rename map (raw -> cleaned). Supports embedded newlines in headers.
-    rename_map: dict[str, str] | None = None
+    # Left out of the hash (dicts aren't hashable) so configs can key caches.
+    rename_map: dict[str, str] | None = field(default=None, hash=False)
+
+    # Derived columns to add to the output (all of DERIVED_COLUMNS when None).
+    # Unrequested ones are only computed as temporaries, never stored.
+    output_columns: frozenset[str] | None = None
 
     def __post_init__(self) -> None:
+        if self.output_columns is not None:
+            object.__setattr__(self, "output_columns", frozenset(self.output_columns))
+            unknown = self.output_columns - set(DERIVED_COLUMNS)
+            if unknown:
+                raise ValueError(
+                    f"Unknown output columns: {sorted(unknown)}. Supported: {list(DERIVED_COLUMNS)}."
+                )
+
         # dataclass(frozen=True) requires object.__setattr__
         object.__setattr__(
             self,
@@ -2,38 +2,19 @@
 
 from __future__ import annotations
 
+import os
 import tempfile
+from importlib.util import find_spec
 from pathlib import Path
 
 import pandas as pd
 import pytest
 
-from data_cleaning.app import run_cleaning_job
+from data_cleaning.app import run_cleaning_job, run_cleaning_job_streaming
 from data_cleaning.config import DataCleaningConfig
 
-# Check if parquet is available
-try:
-    import pyarrow  # noqa: F401
-    HAS_PARQUET = True
-except ImportError:
-    try:
-        import fastparquet  # noqa: F401
-        HAS_PARQUET = True
-    except ImportError:
-        HAS_PARQUET = False
-
-
-@pytest.fixture
-def valid_raw_dataframe():
-    """Create a valid raw DataFrame with all required columns."""
-    return pd.DataFrame({
-        "Date": ["2024-01-01", "2024-01-01", "2024-01-02"],
-        "Shift_period": ["Day", "Night", "Day"],
-        "Machine-number": ["M1", "M1", "M2"],
-        "Style-description": ["Style A", "Style A", "Style B"],
-        "Run_time": ["06:00:00", "07:00:00", "06:30:00"],
-        "RPM": [5000, 6000, 5500],
-    })
+# Check if parquet is available (without importing it)
+HAS_PARQUET = find_spec("pyarrow") is not None or find_spec("fastparquet") is not None
 
 
 class TestRunCleaningJob:
@@ -69,19 +50,76 @@ class TestRunCleaningJob:
             assert len(df_output) >= 0
 
     @pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow or fastparquet not installed")
-    def test_parquet_to_csv(self, valid_raw_dataframe):
+    def test_parquet_to_csv(self, input_parquet, tmp_path):
         """Test cleaning from Parquet to CSV."""
+        output_path = tmp_path / "output.csv"
+
+        run_cleaning_job(input_parquet, output_path)
+
+        assert output_path.exists()
+        df_output = pd.read_csv(output_path)
+        assert len(df_output) >= 0
+
+    @pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow or fastparquet not installed")
+    def test_parquet_pushdown(self, valid_raw_dataframe):
+        """Test that Parquet reads skip rows above rpm_max and keep the other columns."""
         with tempfile.TemporaryDirectory() as tmpdir:
             input_path = Path(tmpdir) / "input.parquet"
             output_path = Path(tmpdir) / "output.csv"
 
-            valid_raw_dataframe.to_parquet(input_path, index=False)
+            df_raw = valid_raw_dataframe.assign(Operator=["A", "B", "C"])
+            df_raw.to_parquet(input_path, index=False)
 
-            run_cleaning_job(input_path, output_path)
+            cfg = DataCleaningConfig(rpm_max=5500, efficiency_min=0.0)
+            run_cleaning_job(input_path, output_path, config=cfg)
 
-            assert output_path.exists()
             df_output = pd.read_csv(output_path)
-            assert len(df_output) >= 0
+            assert df_output["Operator"].tolist() == ["A", "C"]
+            assert (df_output["RPM"] <= 5500).all()
+            assert len(df_output) == 2
+
+    @pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow or fastparquet not installed")
+    def test_parquet_with_text_rpm(self, valid_raw_dataframe):
+        """Test that a text RPM column is still coerced and filtered by the cleaner."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_path = Path(tmpdir) / "input.parquet"
+            output_path = Path(tmpdir) / "output.csv"
+
+            df_raw = valid_raw_dataframe.assign(RPM=["5000", "6000", "5500"])
+            df_raw.to_parquet(input_path, index=False)
+
+            cfg = DataCleaningConfig(rpm_max=5500, efficiency_min=0.0)
+            run_cleaning_job(input_path, output_path, config=cfg)
+
+            df_output = pd.read_csv(output_path, usecols=["RPM"])
+            assert (df_output["RPM"] <= 5500).all()
+            assert len(df_output) == 2
+
+    @pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow not installed")
+    def test_cache_feather(self, valid_raw_dataframe):
+        """Test that the Feather side-car is written once and reused while fresh."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_path = Path(tmpdir) / "input.csv"
+            sidecar = Path(tmpdir) / "input.csv.feather"
+            output_path = Path(tmpdir) / "output.csv"
+            cfg = DataCleaningConfig(efficiency_min=0.0)
+
+            valid_raw_dataframe.to_csv(input_path, index=False)
+            run_cleaning_job(input_path, output_path, config=cfg, cache_feather=True)
+            assert sidecar.exists()
+            expected = pd.read_csv(output_path)
+
+            # An input older than its side-car is not parsed again.
+            input_path.write_text("not,a,production,file\n")
+            stamp = sidecar.stat().st_mtime - 10
+            os.utime(input_path, (stamp, stamp))
+            run_cleaning_job(input_path, output_path, config=cfg, cache_feather=True)
+            pd.testing.assert_frame_equal(pd.read_csv(output_path), expected)
+
+            # A newer input invalidates it.
+            os.utime(input_path, (stamp + 20, stamp + 20))
+            with pytest.raises(KeyError, match="Missing required columns"):
+                run_cleaning_job(input_path, output_path, config=cfg, cache_feather=True)
 
     def test_with_custom_config(self, valid_raw_dataframe):
         """Test cleaning with custom config."""
@@ -92,10 +130,9 @@ class TestRunCleaningJob:
             valid_raw_dataframe.to_csv(input_path, index=False)
 
             cfg = DataCleaningConfig(rpm_max=5500)  # Will filter out some rows
-            run_cleaning_job(input_path, output_path, config=cfg)
+            df_output = run_cleaning_job(input_path, output_path, config=cfg)
 
             assert output_path.exists()
-            df_output = pd.read_csv(output_path)
             assert (df_output["RPM"] <= 5500).all()
 
     def test_with_format_override(self, valid_raw_dataframe):
@@ -139,7 +176,7 @@ class TestRunCleaningJob:
 
             run_cleaning_job(input_path, output_path)
 
-            df_output = pd.read_csv(output_path)
+            df_output = pd.read_csv(output_path, nrows=0)  # header only
             assert "Run_time_seconds" in df_output.columns
             assert "Run_time_per_spindle_seconds" in df_output.columns
             assert "Run_time_per_spindle_hours" in df_output.columns
@@ -161,3 +198,122 @@ class TestRunCleaningJob:
 
             with pytest.raises(KeyError, match="Missing required columns"):
                 run_cleaning_job(input_path, output_path)
+
+
+@pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow not installed")
+class TestRunCleaningJobStreaming:
+    """Test cases for run_cleaning_job_streaming function."""
+
+    @pytest.mark.parametrize("ext", ["csv", "parquet"])
+    def test_matches_in_memory_job(self, valid_raw_dataframe, input_parquet, tmp_path, ext):
+        """Test that batched cleaning keeps the same rows as the in-memory job."""
+        expected_path = tmp_path / "expected.parquet"
+        output_path = tmp_path / "output.parquet"
+
+        if ext == "csv":
+            input_path = tmp_path / "input.csv"
+            valid_raw_dataframe.to_csv(input_path, index=False)
+        else:
+            input_path = input_parquet
+
+        cfg = DataCleaningConfig(efficiency_min=0.0)
+        run_cleaning_job(input_path, expected_path, config=cfg)
+        run_cleaning_job_streaming(input_path, output_path, config=cfg, batch_rows=1)
+
+        pd.testing.assert_frame_equal(
+            pd.read_parquet(output_path), pd.read_parquet(expected_path)
+        )
+
+    def test_drops_other_columns(self, valid_raw_dataframe, tmp_path):
+        """Test that only the required columns are read, unlike the in-memory job."""
+        input_path = tmp_path / "input.csv"
+        output_path = tmp_path / "output.csv"
+        valid_raw_dataframe.assign(Operator=["A", "B", "C"]).to_csv(input_path, index=False)
+
+        run_cleaning_job_streaming(input_path, output_path, config=DataCleaningConfig(efficiency_min=0.0))
+
+        df_output = pd.read_csv(output_path)
+        assert "Operator" not in df_output.columns
+        assert len(df_output) == 3
+
+    def test_multi_style_shift_across_batches(self):
+        """Test that a shift whose styles land in different batches is dropped."""
+        df_raw = pd.DataFrame({
+            "Date": ["2024-01-01", "2024-01-01", "2024-01-01"],
+            "Shift_period": ["Day", "Night", "Day"],
+            "Machine-number": ["M1", "M1", "M1"],
+            "Style-description": ["Style A", "Style A", "Style B"],
+            "Run_time": ["06:00:00", "06:30:00", "06:00:00"],
+            "RPM": [5000, 5000, 5000],
+        })
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_path = Path(tmpdir) / "input.csv"
+            output_path = Path(tmpdir) / "output.csv"
+
+            df_raw.to_csv(input_path, index=False)
+
+            cfg = DataCleaningConfig(efficiency_min=0.0)
+            run_cleaning_job_streaming(input_path, output_path, config=cfg, batch_rows=1)
+
+            df_output = pd.read_csv(output_path, usecols=["Shift_period"])
+            assert df_output["Shift_period"].tolist() == ["Night"]
+
+    def test_dirty_csv_cell_after_first_block(self, tmp_path):
+        """Test that a bad cell past the first CSV block is dropped like in the in-memory job."""
+        rows = 40_000
+        df_raw = pd.DataFrame({
+            "Date": ["2024-01-01"] * rows,
+            "Shift_period": ["Day"] * rows,
+            "Machine-number": [f"M{i}" for i in range(rows)],
+            "Style-description": ["Style A"] * rows,
+            "Run_time": ["06:00:00"] * rows,
+            "RPM": ["5000"] * rows,
+        })
+        df_raw.loc[rows - 1, ["Date", "RPM"]] = ["not-a-date", "fast"]
+
+        input_path = tmp_path / "input.csv"
+        expected_path = tmp_path / "expected.parquet"
+        output_path = tmp_path / "output.parquet"
+        df_raw.to_csv(input_path, index=False)
+        assert input_path.stat().st_size > 1 << 20
+
+        cfg = DataCleaningConfig(efficiency_min=0.0)
+        run_cleaning_job(input_path, expected_path, config=cfg)
+        run_cleaning_job_streaming(input_path, output_path, config=cfg)
+
+        df_output = pd.read_parquet(output_path)
+        assert len(df_output) == rows - 1
+        pd.testing.assert_frame_equal(
+            df_output,
+            pd.read_parquet(expected_path),
+            check_dtype=False,  # the in-memory read sees the bad RPM and widens it to float
+            check_categorical=False,
+        )
+
+    def test_all_rows_filtered_writes_header(self, input_parquet, tmp_path):
+        """Test that an empty result still produces an output file."""
+        output_path = tmp_path / "output.csv"
+
+        cfg = DataCleaningConfig(rpm_max=100)
+        run_cleaning_job_streaming(input_parquet, output_path, config=cfg)
+
+        df_output = pd.read_csv(output_path)
+        assert len(df_output) == 0
+        assert "Machine_Efficiency" in df_output.columns
+
+    def test_missing_columns_raises_error(self):
+        """Test that missing columns raise an error."""
+        df_incomplete = pd.DataFrame({
+            "Date": ["2024-01-01"],
+            "Shift_period": ["Day"],
+        })
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_path = Path(tmpdir) / "input.csv"
+            output_path = Path(tmpdir) / "output.csv"
+
+            df_incomplete.to_csv(input_path, index=False)
+
+            with pytest.raises(KeyError, match="Missing required columns"):
+                run_cleaning_job_streaming(input_path, output_path)
@@ -0,0 +1,363 @@
+"""Tests for the web backend's background cleaning jobs."""
+
+from __future__ import annotations
+
+import importlib
+import io
+import json
+import socket
+import subprocess
+import sys
+import time
+from importlib.util import find_spec
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_cleaning.config import DataCleaningConfig
+
+BACKEND_DIR = Path(__file__).parent.parent / "web" / "backend"
+
+# The backend's own requirements (web/backend/requirements.txt)
+HAS_BACKEND = all(
+    find_spec(name) is not None
+    for name in ("flask", "flask_compress", "flask_cors", "flask_sqlalchemy", "orjson", "pyarrow")
+)
+
+pytestmark = pytest.mark.skipif(not HAS_BACKEND, reason="web backend requirements not installed")
+HAS_EXCEL = find_spec("openpyxl") is not None
+
+# Cleans to the same 30 rows: one row per machine, all well within the limits
+RAW_ROWS = 30
+RAW_DATAFRAME = pd.DataFrame({
+    "Date": ["2024-01-01"] * RAW_ROWS,
+    "Shift_period": ["Day"] * RAW_ROWS,
+    "Machine-number": [f"M{i}" for i in range(RAW_ROWS)],
+    "Style-description": ["Style A"] * RAW_ROWS,
+    "Run_time": ["06:00:00"] * RAW_ROWS,
+    "RPM": [5000] * RAW_ROWS,
+})
+
+
+@pytest.fixture(scope="module")
+def backend(tmp_path_factory):
+    """The backend's app module, with its database and file folders in a temp dir."""
+    tmp = tmp_path_factory.mktemp("backend")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.syspath_prepend(str(BACKEND_DIR))
+        mp.setenv("DATABASE_URL", f"sqlite:///{tmp / 'backend.db'}")
+        config = importlib.import_module("config")
+        mp.setattr(config.Config, "UPLOAD_FOLDER", tmp / "uploads")
+        mp.setattr(config.Config, "OUTPUT_FOLDER", tmp / "outputs")
+        module = importlib.import_module("app")
+        yield module
+        for name in ("app", "config", "models"):
+            sys.modules.pop(name, None)
+
+
+def add_job(backend, worker=None):
+    """Record an input file and an output file waiting on a cleaning job; returns their ids."""
+    DataFile, db = backend.DataFile, backend.db
+    input_file = DataFile(
+        original_filename="input.csv",
+        stored_filename=f"{backend.uuid.uuid4().hex}.csv",
+        file_type="csv",
+        file_size=0,
+        category="input",
+    )
+    db.session.add(input_file)
+    db.session.flush()
+    output_file = DataFile(
+        original_filename="cleaned_input.csv",
+        stored_filename=f"{backend.uuid.uuid4().hex}.csv",
+        file_type="csv",
+        file_size=0,
+        category="output",
+        parent_id=input_file.id,
+        status="processing",
+        worker=worker,
+    )
+    db.session.add(output_file)
+    db.session.commit()
+    return input_file.id, output_file.id
+
+
+class TestRunProcessingJob:
+    """Test cases for run_processing_job function."""
+
+    def test_deleted_input_fails_job(self, backend):
+        """Test that a job whose input record is gone is recorded as failed."""
+        app, DataFile, db = backend.app, backend.DataFile, backend.db
+        with app.app_context():
+            input_id, output_id = add_job(backend)
+            DataFile.query.filter_by(id=input_id).delete()
+            db.session.commit()
+
+        backend.run_processing_job(app, output_id, DataCleaningConfig())
+
+        with app.app_context():
+            output_file = db.session.get(DataFile, output_id)
+            assert output_file.status == "failed"
+            assert "deleted" in output_file.error_message
+            assert output_file.processed_at is not None
+
+    def test_missing_input_file_fails_job(self, backend):
+        """Test that a job whose input file is missing on disk fails without leaving output."""
+        app, DataFile, db = backend.app, backend.DataFile, backend.db
+        with app.app_context():
+            _, output_id = add_job(backend)
+            output_path = backend.file_disk_path(db.session.get(DataFile, output_id))
+
+        backend.run_processing_job(app, output_id, DataCleaningConfig())
+
+        with app.app_context():
+            assert db.session.get(DataFile, output_id).status == "failed"
+        assert not output_path.exists()
+
+    def test_deleted_job_is_skipped(self, backend):
+        """Test that a job whose records were deleted before it ran does nothing."""
+        app, DataFile, db = backend.app, backend.DataFile, backend.db
+        with app.app_context():
+            input_id, output_id = add_job(backend)
+            db.session.delete(db.session.get(DataFile, input_id))
+            db.session.commit()
+
+        backend.run_processing_job(app, output_id, DataCleaningConfig())
+
+        with app.app_context():
+            assert db.session.get(DataFile, output_id) is None
+
+
+class TestCreateApp:
+    """Test cases for create_app function."""
+
+    def test_interrupted_jobs_marked_failed(self, backend):
+        """Test that jobs whose process has exited are failed at startup."""
+        exited = subprocess.Popen([sys.executable, "-c", "pass"])
+        exited.wait()
+        with backend.app.app_context():
+            _, legacy_id = add_job(backend)
+            _, exited_id = add_job(backend, worker=f"{socket.gethostname()}:{exited.pid}")
+
+        app = backend.create_app()
+
+        with app.app_context():
+            for output_id in (legacy_id, exited_id):
+                output_file = backend.db.session.get(backend.DataFile, output_id)
+                assert output_file.status == "failed"
+                assert "restart" in output_file.error_message
+
+    def test_running_jobs_left_alone(self, backend):
+        """Test that jobs of processes that may still be running are not failed at startup."""
+        with backend.app.app_context():
+            _, own_id = add_job(backend, worker=backend.worker_id())
+            _, remote_id = add_job(backend, worker="other-host:1")
+
+        app = backend.create_app()
+
+        with app.app_context():
+            for output_id in (own_id, remote_id):
+                assert backend.db.session.get(backend.DataFile, output_id).status == "processing"
+
+
+def file_bytes(df: pd.DataFrame, fmt: str) -> bytes:
+    buffer = io.BytesIO()
+    if fmt == "csv":
+        df.to_csv(buffer, index=False)
+    elif fmt == "xlsx":
+        df.to_excel(buffer, index=False)
+    else:
+        df.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+def upload(client, df: pd.DataFrame, fmt: str) -> dict:
+    """Upload `df` as a `fmt` file; returns the created file record."""
+    response = client.post(
+        "/api/upload",
+        data={"file": (io.BytesIO(file_bytes(df, fmt)), f"input.{fmt}")},
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()["file"]
+
+
+def process(client, file_id: int, output_format: str) -> dict:
+    """Clean input `file_id` into an `output_format` file; returns the finished job."""
+    response = client.post(
+        f"/api/process/{file_id}",
+        json={"output_format": output_format, "efficiency_min": 0.0},
+    )
+    assert response.status_code == 202
+    job_id = response.get_json()["job_id"]
+    deadline = time.monotonic() + 30
+    while True:
+        job = client.get(f"/api/jobs/{job_id}").get_json()
+        if job["status"] != "processing" or time.monotonic() > deadline:
+            return job
+        time.sleep(0.05)
+
+
+def page(client, file_id: int, **params) -> dict:
+    response = client.get(f"/api/files/{file_id}/data", query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+@pytest.fixture
+def client(backend):
+    return backend.app.test_client()
+
+
+class TestUploadFile:
+    """Test cases for the upload route."""
+
+    @pytest.mark.parametrize(
+        "fmt, stored_suffix",
+        [
+            ("csv", ".feather"),
+            pytest.param("xlsx", ".feather", marks=pytest.mark.skipif(not HAS_EXCEL, reason="openpyxl not installed")),
+            ("parquet", ".parquet"),
+        ],
+    )
+    def test_records_metadata(self, backend, client, fmt, stored_suffix):
+        """Test that uploads record their row count and columns, and how they are stored."""
+        record = upload(client, RAW_DATAFRAME, fmt)
+
+        assert record["row_count"] == RAW_ROWS
+        assert record["column_count"] == len(RAW_DATAFRAME.columns)
+        assert record["file_type"] == fmt
+        assert record["status"] == "completed"
+        upload_dir = backend.app.extensions["file_dirs"]["input"]
+        stored = upload_dir / record["stored_filename"]
+        assert stored.suffix == stored_suffix
+        assert stored.exists()
+        # The upload itself is kept for downloads
+        assert stored.with_suffix(f".{fmt}").exists()
+        with backend.app.app_context():
+            file = backend.db.session.get(backend.DataFile, record["id"])
+            assert json.loads(file.columns_json) == list(RAW_DATAFRAME.columns)
+
+    def test_unreadable_file_rejected(self, backend, client):
+        """Test that a file that can't be parsed is rejected and not kept."""
+        upload_dir = backend.app.extensions["file_dirs"]["input"]
+        before = set(upload_dir.iterdir())
+        response = client.post(
+            "/api/upload",
+            data={"file": (io.BytesIO(b"not parquet"), "input.parquet")},
+            content_type="multipart/form-data",
+        )
+        assert response.status_code == 400
+        assert set(upload_dir.iterdir()) == before
+
+
+class TestGetFileData:
+    """Test cases for the file data (paging) route."""
+
+    @pytest.mark.parametrize(
+        "fmt",
+        [
+            "csv",  # stored as Feather
+            "parquet",
+            pytest.param("xlsx", marks=pytest.mark.skipif(not HAS_EXCEL, reason="openpyxl not installed")),
+        ],
+    )
+    def test_pages_uploads(self, client, fmt):
+        """Test that each stored input format pages the same rows."""
+        record = upload(client, RAW_DATAFRAME, fmt)
+
+        result = page(client, record["id"], page=2, per_page=7)
+
+        assert result["columns"] == list(RAW_DATAFRAME.columns)
+        assert result["pagination"] == {"page": 2, "per_page": 7, "total_rows": RAW_ROWS, "total_pages": 5}
+        assert [row["Machine-number"] for row in result["data"]] == [f"M{i}" for i in range(7, 14)]
+        assert result["data"][0]["RPM"] == 5000
+        assert result["data"][0]["Date"] == "2024-01-01"
+
+    @pytest.mark.skipif(not HAS_EXCEL, reason="openpyxl not installed")
+    def test_pages_excel_with_mixed_column(self, backend, client):
+        """Test that Excel files Arrow can't hold are stored as uploaded and still paged."""
+        df = RAW_DATAFRAME.assign(Note=[1, "x"] * (RAW_ROWS // 2))
+        record = upload(client, df, "xlsx")
+        assert record["stored_filename"].endswith(".xlsx")
+
+        result = page(client, record["id"], page=3, per_page=10)
+
+        assert [row["Note"] for row in result["data"]] == [1, "x"] * 5
+        assert [row["Machine-number"] for row in result["data"]] == [f"M{i}" for i in range(20, 30)]
+
+    @pytest.mark.parametrize("row_index", [True, False])
+    def test_pages_csv_output(self, backend, client, row_index):
+        """Test that csv outputs page the same rows with and without their row index."""
+        job = process(client, upload(client, RAW_DATAFRAME, "csv")["id"], "csv")
+        assert job["status"] == "completed", job["error"]
+        output = job["output_file"]
+        output_path = backend.app.extensions["file_dirs"]["output"] / output["stored_filename"]
+        assert backend.row_index_path(output_path).exists()
+        if not row_index:
+            backend.row_index_path(output_path).unlink()
+
+        result = page(client, output["id"], page=2, per_page=10, columns=["Machine-number", "RPM"])
+
+        assert result["columns"] == ["Machine-number", "RPM"]
+        assert result["pagination"]["total_rows"] == RAW_ROWS
+        assert result["data"] == [{"Machine-number": f"M{i}", "RPM": 5000} for i in range(10, 20)]
+
+    def test_columns_projection(self, client):
+        """Test that ?columns= selects and orders columns, and unknown ones are rejected."""
+        record = upload(client, RAW_DATAFRAME, "parquet")
+
+        result = page(client, record["id"], per_page=2, columns=["RPM", "Date"])
+        assert result["columns"] == ["RPM", "Date"]
+        assert result["data"] == [{"RPM": 5000, "Date": "2024-01-01"}] * 2
+
+        response = client.get(f"/api/files/{record['id']}/data", query_string={"columns": ["Nope"]})
+        assert response.status_code == 400
+        assert "Nope" in response.get_json()["error"]
+
+    def test_nan_and_dates(self, client):
+        """Test that NaN is sent as null and timestamps as ISO strings."""
+        df = pd.DataFrame({
+            "Date": pd.to_datetime(["2024-01-01 00:00:00", "2024-01-02 06:30:00"]),
+            "Value": [np.nan, 1.5],
+        })
+        record = upload(client, df, "parquet")
+
+        result = page(client, record["id"])
+
+        assert result["data"] == [
+            {"Date": "2024-01-01T00:00:00.000", "Value": None},
+            {"Date": "2024-01-02T06:30:00.000", "Value": 1.5},
+        ]
+
+    def test_page_past_the_end(self, client):
+        """Test that a page after the last row is empty."""
+        record = upload(client, RAW_DATAFRAME, "csv")
+
+        result = page(client, record["id"], page=10, per_page=50)
+
+        assert result["data"] == []
+
+
+class TestDeleteFile:
+    """Test cases for the delete route."""
+
+    def test_deletes_sidecars_and_outputs(self, backend, client):
+        """Test that deleting an input removes its files, its outputs and their row indexes."""
+        record = upload(client, RAW_DATAFRAME, "csv")
+        job = process(client, record["id"], "csv")
+        assert job["status"] == "completed", job["error"]
+        dirs = backend.app.extensions["file_dirs"]
+        stored = dirs["input"] / record["stored_filename"]
+        output_path = dirs["output"] / job["output_file"]["stored_filename"]
+        paths = [stored, stored.with_suffix(".csv"), output_path, backend.row_index_path(output_path)]
+        assert all(path.exists() for path in paths)
+
+        response = client.delete(f"/api/files/{record['id']}")
+
+        assert response.status_code == 200
+        assert not any(path.exists() for path in paths)
+        assert client.get(f"/api/files/{job['output_file']['id']}").status_code == 404
+        assert client.get(f"/api/files/{record['id']}/data").status_code == 404
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -9,44 +10,25 @@ from data_cleaning.cleaner import DataCleaner
 from data_cleaning.config import DataCleaningConfig
 
 
-@pytest.fixture
-def valid_raw_dataframe():
-    """Create a valid raw DataFrame with all required columns.
-    
-    Runtime is calculated to produce ~90% efficiency with default config:
-    - shift_hours = 8 = 28800 seconds
-    - spindles = 84
-    - Target efficiency ~90% requires: Run_time_seconds = 0.9 * 28800 * 84 = 2177280 sec
-    - That's about 604:48:00 (too long for typical display)
-    
-    Actually efficiency = Run_time_seconds / (shift_hours * 3600 * spindles) * 100
-    For 8h shift and 84 spindles: total = 28800 * 84 = 2419200 seconds
-    
-    To get ~90% efficiency: Run_time_seconds = 0.9 * 2419200 = 2177280 seconds = 604:48:00
-    
-    This is unrealistic. The formula seems designed for total runtime across all spindles.
-    Let's use a lower efficiency threshold in our tests or adjust accordingly.
+@pytest.fixture(scope="module")
+def cleaned_default_df(valid_raw_dataframe):
+    """valid_raw_dataframe cleaned with the default config, shared by assertion-only tests.
+
+    efficiency_min=0 keeps every row after the efficiency filter.
     """
-    return pd.DataFrame({
-        "Date": ["2024-01-01", "2024-01-01", "2024-01-02"],
-        "Shift_period": ["Day", "Night", "Day"],
-        "Machine-number": ["M1", "M1", "M2"],
-        "Style-description": ["Style A", "Style A", "Style B"],
-        "Run_time": ["06:00:00", "07:00:00", "06:30:00"],
-        "RPM": [5000, 6000, 5500],
-    })
+    return DataCleaner(DataCleaningConfig(efficiency_min=0.0)).clean(valid_raw_dataframe)
 
 
 @pytest.fixture
 def dataframe_with_embedded_newlines():
     """Create a DataFrame with column names containing embedded newlines."""
     return pd.DataFrame({
-        "Date": ["2024-01-01"],
-        "Shift\nperiod": ["Day"],
-        "Machine-number": ["M1"],
-        "Style-description": ["Style A"],
-        "Run\ntime": ["06:00:00"],
-        "RPM": [5000],
+        "Date": np.array(["2024-01-01"], dtype="U10"),
+        "Shift\nperiod": np.array(["Day"], dtype="U3"),
+        "Machine-number": np.array(["M1"], dtype="U2"),
+        "Style-description": np.array(["Style A"], dtype="U7"),
+        "Run\ntime": np.array(["06:00:00"], dtype="U8"),
+        "RPM": np.array([5000], dtype=np.int32),
     })
 
 
@@ -64,14 +46,32 @@ class TestDataCleaner:
         cleaner = DataCleaner(config=cfg)
         assert cleaner.config.rpm_max == 8000
 
+    def test_compile_matches_clean(self, valid_raw_dataframe):
+        """Test that compile() returns a clean function bound to the config."""
+        cleaner = DataCleaner(DataCleaningConfig(efficiency_min=0.0))
+        clean = cleaner.compile()
+        expected = cleaner.clean(valid_raw_dataframe)
+
+        cleaner.config = DataCleaningConfig(rpm_max=0)
+        pd.testing.assert_frame_equal(clean(valid_raw_dataframe), expected)
+
     def test_does_not_mutate_input(self, valid_raw_dataframe):
         """Test that clean() does not mutate the input DataFrame."""
         # Use efficiency_min=0 to keep rows after efficiency filter
         cfg = DataCleaningConfig(efficiency_min=0.0)
         cleaner = DataCleaner(config=cfg)
-        original = valid_raw_dataframe.copy()
+
+        def fingerprint(df):
+            # Content hashes work for every dtype, including Arrow-backed strings
+            # that have no NumPy buffer to compare.
+            return {
+                col: (df[col].dtype, pd.util.hash_pandas_object(df[col], index=False).to_numpy().tobytes())
+                for col in df.columns
+            }
+
+        before = fingerprint(valid_raw_dataframe)
         _ = cleaner.clean(valid_raw_dataframe)
-        pd.testing.assert_frame_equal(valid_raw_dataframe, original)
+        assert fingerprint(valid_raw_dataframe) == before
 
     def test_column_renaming(self, dataframe_with_embedded_newlines):
         """Test that columns with embedded newlines are renamed."""
@@ -97,14 +97,61 @@ class TestDataCleaner:
         with pytest.raises(KeyError, match="Missing required columns"):
             cleaner.clean(df)
 
-    def test_date_coercion(self, valid_raw_dataframe):
+    def test_date_coercion(self, cleaned_default_df):
         """Test that Date column is coerced to datetime."""
-        # Use efficiency_min=0 to keep rows after efficiency filter
-        cfg = DataCleaningConfig(efficiency_min=0.0)
+        assert pd.api.types.is_datetime64_any_dtype(cleaned_default_df["Date"])
+
+    @pytest.mark.parametrize("date_format", [None, "%Y-%m-%d"])
+    def test_dates_have_second_resolution(self, valid_raw_dataframe, date_format):
+        """Test that dates are stored as datetime64[s] whatever their input unit."""
+        cfg = DataCleaningConfig(efficiency_min=0.0, date_format=date_format)
+        cleaner = DataCleaner(config=cfg)
+
+        as_ns = pd.to_datetime(valid_raw_dataframe["Date"]).dt.as_unit("ns")
+        for dates in (valid_raw_dataframe["Date"], as_ns):
+            df = cleaner.clean(valid_raw_dataframe.assign(Date=dates))
+            assert df["Date"].dtype == "datetime64[s]"
+            assert df["Date"].iloc[0] == pd.Timestamp("2024-01-01")
+
+    @pytest.mark.parametrize(
+        "date_format, dates",
+        [
+            (None, ["1500-01-01", "2024-01-01", "3000-12-31"]),
+            ("%Y-%m-%d", ["1500-01-01", "2024-01-01", "3000-12-31"]),
+            ("%d/%m/%Y", ["1/1/1500", "1/1/2024", "31/12/3000"]),
+        ],
+    )
+    def test_dates_outside_nanosecond_range(self, valid_raw_dataframe, date_format, dates):
+        """Test that dates before 1677 and after 2262 are kept, with or without a date_format."""
+        cfg = DataCleaningConfig(efficiency_min=0.0, date_format=date_format)
+        df = DataCleaner(config=cfg).clean(valid_raw_dataframe.assign(Date=dates))
+
+        assert df["Date"].tolist() == [
+            pd.Timestamp("1500-01-01"),
+            pd.Timestamp("2024-01-01"),
+            pd.Timestamp("3000-12-31"),
+        ]
+
+    def test_date_format(self, valid_raw_dataframe):
+        """Test that date_format parses dates with exactly that format."""
+        df_raw = valid_raw_dataframe.copy()
+        df_raw["Date"] = ["15/01/2024", "2024-01-15", "30/02/2024"]
+
+        cfg = DataCleaningConfig(efficiency_min=0.0, date_format="%d/%m/%Y")
         cleaner = DataCleaner(config=cfg)
-        df = cleaner.clean(valid_raw_dataframe)
+        df = cleaner.clean(df_raw)
 
-        assert pd.api.types.is_datetime64_any_dtype(df["Date"])
+        assert df["Date"].tolist() == [pd.Timestamp("2024-01-15")]
+
+    def test_date_format_unpadded(self, valid_raw_dataframe):
+        """Test that dates without zero padding, which don't format back the same, still parse."""
+        df_raw = valid_raw_dataframe.copy()
+        df_raw["Date"] = ["1/2/2024", "01/02/2024", "2/2/2024"]
+
+        cfg = DataCleaningConfig(efficiency_min=0.0, date_format="%d/%m/%Y")
+        df = DataCleaner(config=cfg).clean(df_raw)
+
+        assert df["Date"].tolist() == [pd.Timestamp("2024-02-01")] * 2 + [pd.Timestamp("2024-02-02")]
 
     def test_rpm_coercion(self, valid_raw_dataframe):
         """Test that RPM column is coerced to numeric."""
@@ -118,16 +165,30 @@ class TestDataCleaner:
 
         assert pd.api.types.is_numeric_dtype(df["RPM"])
 
-    def test_run_time_seconds_calculated(self, valid_raw_dataframe):
+    def test_key_columns_categorical(self, cleaned_default_df):
+        """Test that shift, machine and style columns become categoricals."""
+        df = cleaned_default_df
+        for col in ("Shift_period", "Machine-number", "Style-description"):
+            assert isinstance(df[col].dtype, pd.CategoricalDtype)
+
+    def test_run_time_seconds_calculated(self, cleaned_default_df):
         """Test that Run_time_seconds is calculated from Run_time."""
-        # Use efficiency_min=0 to keep rows after efficiency filter
-        cfg = DataCleaningConfig(efficiency_min=0.0)
-        cleaner = DataCleaner(config=cfg)
-        df = cleaner.clean(valid_raw_dataframe)
+        df = cleaned_default_df
 
         assert "Run_time_seconds" in df.columns
         # 06:00:00 = 6 * 3600 = 21600 seconds
-        assert df.iloc[0]["Run_time_seconds"] == 21600.0
+        assert df["Run_time_seconds"].iat[0] == 21600.0
+
+    def test_run_time_seconds_formats(self, valid_raw_dataframe):
+        """Test that long, fractional and day-prefixed run times are parsed."""
+        df_raw = valid_raw_dataframe.copy()
+        df_raw["Run_time"] = ["604:48:00", "06:00:00.5", "0 days 06:30:00"]
+
+        cfg = DataCleaningConfig(efficiency_min=0.0)
+        cleaner = DataCleaner(config=cfg)
+        df = cleaner.clean(df_raw)
+
+        assert df["Run_time_seconds"].tolist() == [2177280.0, 21600.5, 23400.0]
 
     def test_rpm_max_filter(self, valid_raw_dataframe):
         """Test that rows with RPM > rpm_max are filtered out."""
@@ -153,40 +214,45 @@ class TestDataCleaner:
 
         assert (df["RPM"] <= 5200).all()
 
-    def test_derived_metrics_calculated(self, valid_raw_dataframe):
+    def test_derived_metrics_calculated(self, cleaned_default_df):
         """Test that derived metrics are calculated."""
-        # Use efficiency_min=0 to keep rows after efficiency filter
-        cfg = DataCleaningConfig(efficiency_min=0.0)
-        cleaner = DataCleaner(config=cfg)
-        df = cleaner.clean(valid_raw_dataframe)
+        df = cleaned_default_df
 
         assert "Run_time_per_spindle_seconds" in df.columns
         assert "Run_time_per_spindle_hours" in df.columns
         assert "Machine_Efficiency" in df.columns
 
-    def test_run_time_per_spindle_calculation(self, valid_raw_dataframe):
+    def test_output_columns_limits_derived_columns(self, valid_raw_dataframe, cleaned_default_df):
+        """Test that only the requested derived columns are added."""
+        full = cleaned_default_df
+        cfg = DataCleaningConfig(efficiency_min=0.0, output_columns=frozenset({"Machine_Efficiency"}))
+        df = DataCleaner(config=cfg).clean(valid_raw_dataframe)
+
+        assert list(df.columns) == [*valid_raw_dataframe.columns, "Machine_Efficiency"]
+        pd.testing.assert_series_equal(df["Machine_Efficiency"], full["Machine_Efficiency"])
+
+        cfg = DataCleaningConfig(efficiency_min=0.0, output_columns=frozenset())
+        df = DataCleaner(config=cfg).clean(valid_raw_dataframe)
+        assert list(df.columns) == list(valid_raw_dataframe.columns)
+        assert len(df) == len(full)
+
+    def test_run_time_per_spindle_calculation(self, cleaned_default_df):
         """Test Run_time_per_spindle_seconds calculation."""
-        # Use efficiency_min=0 to keep rows after efficiency filter
-        cfg = DataCleaningConfig(spindles_per_side=84, efficiency_min=0.0)
-        cleaner = DataCleaner(config=cfg)
-        df = cleaner.clean(valid_raw_dataframe)
+        df = cleaned_default_df
 
-        # First row: 06:00:00 = 21600 seconds / 84 spindles
+        # First row: 06:00:00 = 21600 seconds / 84 spindles (the default)
         expected = 21600.0 / 84
-        assert abs(df.iloc[0]["Run_time_per_spindle_seconds"] - expected) < 0.01
+        assert df["Run_time_per_spindle_seconds"].iat[0] == pytest.approx(expected, abs=0.01)
 
-    def test_machine_efficiency_calculation(self, valid_raw_dataframe):
+    def test_machine_efficiency_calculation(self, cleaned_default_df):
         """Test Machine_Efficiency calculation."""
-        # Use efficiency_min=0 to keep rows after efficiency filter
-        cfg = DataCleaningConfig(shift_hours=8.0, spindles_per_side=84, efficiency_min=0.0)
-        cleaner = DataCleaner(config=cfg)
-        df = cleaner.clean(valid_raw_dataframe)
+        df = cleaned_default_df
 
-        # First row: 21600 / (8 * 3600 * 84) * 100
+        # First row: 21600 / (8 * 3600 * 84) * 100, with the default 8h shift and 84 spindles
         total_shift_seconds = 8.0 * 3600.0
         spindles = 84.0
         expected = (21600.0 / (total_shift_seconds * spindles)) * 100.0
-        assert abs(df.iloc[0]["Machine_Efficiency"] - expected) < 0.01
+        assert df["Machine_Efficiency"].iat[0] == pytest.approx(expected, abs=0.01)
 
     def test_efficiency_range_filter(self, valid_raw_dataframe):
         """Test that rows outside efficiency range are filtered out."""
@@ -208,61 +274,22 @@ class TestDataCleaner:
         assert (df["Machine_Efficiency"] >= 75.0).all()
         assert (df["Machine_Efficiency"] <= 100.0).all()
 
-    def test_drops_rows_with_invalid_date(self):
-        """Test that rows with invalid dates are dropped."""
-        df_raw = pd.DataFrame({
-            "Date": ["2024-01-01", "invalid_date", "2024-01-02"],
-            "Shift_period": ["Day", "Night", "Day"],
-            "Machine-number": ["M1", "M1", "M2"],
-            "Style-description": ["Style A", "Style A", "Style B"],
-            "Run_time": ["06:00:00", "07:00:00", "06:30:00"],
-            "RPM": [5000, 6000, 5500],
-        })
-
-        # Use efficiency_min=0 to keep rows after efficiency filter
-        cfg = DataCleaningConfig(efficiency_min=0.0)
-        cleaner = DataCleaner(config=cfg)
-        df = cleaner.clean(df_raw)
-
-        # The row with invalid date should be dropped
-        assert len(df) == 2
-
-    def test_drops_rows_with_invalid_rpm(self):
-        """Test that rows with invalid RPM values are dropped."""
-        df_raw = pd.DataFrame({
-            "Date": ["2024-01-01", "2024-01-01", "2024-01-02"],
-            "Shift_period": ["Day", "Night", "Day"],
-            "Machine-number": ["M1", "M1", "M2"],
-            "Style-description": ["Style A", "Style A", "Style B"],
-            "Run_time": ["06:00:00", "07:00:00", "06:30:00"],
-            "RPM": [5000, "invalid", 5500],
-        })
-
-        # Use efficiency_min=0 to keep rows after efficiency filter
-        cfg = DataCleaningConfig(efficiency_min=0.0)
-        cleaner = DataCleaner(config=cfg)
-        df = cleaner.clean(df_raw)
-
-        # The row with invalid RPM should be dropped
-        assert len(df) == 2
-
-    def test_drops_rows_with_invalid_runtime(self):
-        """Test that rows with invalid Run_time values are dropped."""
-        df_raw = pd.DataFrame({
-            "Date": ["2024-01-01", "2024-01-01", "2024-01-02"],
-            "Shift_period": ["Day", "Night", "Day"],
-            "Machine-number": ["M1", "M1", "M2"],
-            "Style-description": ["Style A", "Style A", "Style B"],
-            "Run_time": ["06:00:00", "invalid_time", "06:30:00"],
-            "RPM": [5000, 6000, 5500],
-        })
+    @pytest.mark.parametrize(
+        "col,bad",
+        [("Date", "invalid_date"), ("RPM", "invalid"), ("Run_time", "invalid_time")],
+    )
+    def test_drops_rows_with_invalid_value(self, valid_raw_dataframe, col, bad):
+        """Test that rows with an invalid date, RPM or Run_time value are dropped."""
+        # object dtype so the text value can go into the numeric RPM column
+        df_raw = valid_raw_dataframe.astype({col: object})
+        df_raw.loc[1, col] = bad
 
         # Use efficiency_min=0 to keep rows after efficiency filter
         cfg = DataCleaningConfig(efficiency_min=0.0)
         cleaner = DataCleaner(config=cfg)
         df = cleaner.clean(df_raw)
 
-        # The row with invalid Run_time should be dropped
+        # The row with the invalid value should be dropped
         assert len(df) == 2
 
 
@@ -2,37 +2,39 @@
 
 from __future__ import annotations
 
-import tempfile
-from pathlib import Path
+import csv
+import shutil
+import subprocess
+import sys
+from importlib.util import find_spec
 
 import pandas as pd
 import pytest
 
-from data_cleaning.cli import build_parser, main
-
-# Check if parquet is available
-try:
-    import pyarrow  # noqa: F401
-    HAS_PARQUET = True
-except ImportError:
-    try:
-        import fastparquet  # noqa: F401
-        HAS_PARQUET = True
-    except ImportError:
-        HAS_PARQUET = False
-
-
-@pytest.fixture
-def valid_raw_dataframe():
-    """Create a valid raw DataFrame with all required columns."""
-    return pd.DataFrame({
-        "Date": ["2024-01-01", "2024-01-01", "2024-01-02"],
-        "Shift_period": ["Day", "Night", "Day"],
-        "Machine-number": ["M1", "M1", "M2"],
-        "Style-description": ["Style A", "Style A", "Style B"],
-        "Run_time": ["06:00:00", "07:00:00", "06:30:00"],
-        "RPM": [5000, 6000, 5500],
-    })
+from data_cleaning.cleaner import DataCleaner
+from data_cleaning.cli import build_parser, main, run
+from data_cleaning.config import DataCleaningConfig
+
+# Check if parquet is available (without importing it)
+HAS_PARQUET = find_spec("pyarrow") is not None or find_spec("fastparquet") is not None
+
+
+@pytest.fixture(scope="session")
+def parser():
+    """One parser shared by the parse_args tests; parsing doesn't change it."""
+    return build_parser()
+
+
+@pytest.fixture(scope="session")
+def shared_input_csv(tmp_path_factory, valid_raw_dataframe):
+    """The valid raw DataFrame written to CSV once, for tests that only read it."""
+    path = tmp_path_factory.mktemp("in", numbered=True) / "input.csv"
+    # Plain values with no quoting needs, so the csv module is all it takes.
+    with path.open("w", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(valid_raw_dataframe.columns)
+        writer.writerows(valid_raw_dataframe.itertuples(index=False))
+    return path
 
 
 class TestBuildParser:
@@ -44,10 +46,8 @@ class TestBuildParser:
         assert parser is not None
         assert parser.prog == "data-clean"
 
-    def test_required_positional_args(self):
+    def test_required_positional_args(self, parser):
         """Test that input and output are required positional arguments."""
-        parser = build_parser()
-
         # Should fail without arguments
         with pytest.raises(SystemExit):
             parser.parse_args([])
@@ -56,17 +56,15 @@ class TestBuildParser:
         with pytest.raises(SystemExit):
             parser.parse_args(["input.csv"])
 
-    def test_positional_args_parsing(self):
+    def test_positional_args_parsing(self, parser):
         """Test parsing of positional arguments."""
-        parser = build_parser()
         args = parser.parse_args(["input.csv", "output.csv"])
 
         assert args.input == "input.csv"
         assert args.output == "output.csv"
 
-    def test_default_values(self):
+    def test_default_values(self, parser):
         """Test default values for optional arguments."""
-        parser = build_parser()
         args = parser.parse_args(["input.csv", "output.csv"])
 
         assert args.input_format is None
@@ -76,51 +74,58 @@ class TestBuildParser:
         assert args.eff_max == 100.0
         assert args.spindles == 84
         assert args.shift_hours == 8.0
+        assert args.date_format is None
         assert args.keep_multi_style_shifts is False
+        assert args.streaming is False
+        assert args.cache_feather is False
+        assert args.parquet_compression is None
+        assert args.parquet_compression_level is None
+        assert args.parquet_row_group_size is None
+
+    @pytest.mark.parametrize(
+        "flag,value,attr,expected",
+        [
+            ("--rpm-max", "9000", "rpm_max", 9000.0),
+            ("--eff-min", "70", "eff_min", 70.0),
+            ("--eff-max", "95", "eff_max", 95.0),
+            ("--spindles", "100", "spindles", 100),
+            ("--shift-hours", "12", "shift_hours", 12.0),
+            ("--date-format", "%d/%m/%Y", "date_format", "%d/%m/%Y"),
+        ],
+    )
+    def test_custom_option(self, parser, flag, value, attr, expected):
+        """Test that each custom option is parsed to its attribute."""
+        args = parser.parse_args(["input.csv", "output.csv", flag, value])
+
+        assert getattr(args, attr) == expected
+
+    def test_keep_multi_style_shifts_flag(self, parser):
+        """Test keep-multi-style-shifts flag."""
+        args = parser.parse_args(["input.csv", "output.csv", "--keep-multi-style-shifts"])
 
-    def test_custom_rpm_max(self):
-        """Test custom rpm-max argument."""
-        parser = build_parser()
-        args = parser.parse_args(["input.csv", "output.csv", "--rpm-max", "9000"])
+        assert args.keep_multi_style_shifts is True
 
-        assert args.rpm_max == 9000.0
+    def test_streaming_flag(self, parser):
+        """Test streaming flag."""
+        args = parser.parse_args(["input.csv", "output.csv", "--streaming"])
 
-    def test_custom_efficiency_range(self):
-        """Test custom efficiency range arguments."""
-        parser = build_parser()
+        assert args.streaming is True
+
+    def test_parquet_write_options(self, parser):
+        """Test Parquet output option arguments."""
         args = parser.parse_args([
-            "input.csv", "output.csv",
-            "--eff-min", "70",
-            "--eff-max", "95",
+            "input.csv", "output.parquet",
+            "--parquet-compression", "snappy",
+            "--parquet-compression-level", "1",
+            "--parquet-row-group-size", "1000",
         ])
 
-        assert args.eff_min == 70.0
-        assert args.eff_max == 95.0
-
-    def test_custom_spindles(self):
-        """Test custom spindles argument."""
-        parser = build_parser()
-        args = parser.parse_args(["input.csv", "output.csv", "--spindles", "100"])
-
-        assert args.spindles == 100
+        assert args.parquet_compression == "snappy"
+        assert args.parquet_compression_level == 1
+        assert args.parquet_row_group_size == 1000
 
-    def test_custom_shift_hours(self):
-        """Test custom shift-hours argument."""
-        parser = build_parser()
-        args = parser.parse_args(["input.csv", "output.csv", "--shift-hours", "12"])
-
-        assert args.shift_hours == 12.0
-
-    def test_keep_multi_style_shifts_flag(self):
-        """Test keep-multi-style-shifts flag."""
-        parser = build_parser()
-        args = parser.parse_args(["input.csv", "output.csv", "--keep-multi-style-shifts"])
-
-        assert args.keep_multi_style_shifts is True
-
-    def test_format_override_args(self):
+    def test_format_override_args(self, parser):
         """Test input/output format override arguments."""
-        parser = build_parser()
         args = parser.parse_args([
             "input.data", "output.out",
             "--input-format", "csv",
@@ -134,133 +139,182 @@ class TestBuildParser:
 class TestMain:
     """Test cases for main function."""
 
-    def test_successful_execution(self, valid_raw_dataframe):
+    @pytest.mark.slow
+    def test_help_does_not_import_pandas(self):
+        """Test that --help exits before the heavy dependencies are imported."""
+        code = (
+            "import sys\n"
+            "from data_cleaning.cli import main\n"
+            "try:\n"
+            "    main(['--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "sys.exit('pandas' in sys.modules)\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True)
+        assert result.returncode == 0
+
+    def test_successful_execution(self, shared_input_csv, tmp_path):
         """Test successful CLI execution."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            input_path = Path(tmpdir) / "input.csv"
-            output_path = Path(tmpdir) / "output.csv"
+        output_path = tmp_path / "output.csv"
+
+        result = main([str(shared_input_csv), str(output_path)])
+
+        assert result == 0
+        assert output_path.exists()
 
-            valid_raw_dataframe.to_csv(input_path, index=False)
+    def test_run_returns_cleaned_frame(self, parser, shared_input_csv, tmp_path):
+        """Test that run() returns the cleaned DataFrame it wrote."""
+        output_path = tmp_path / "output.csv"
+        args = parser.parse_args([str(shared_input_csv), str(output_path), "--rpm-max", "5500", "--eff-min", "0"])
 
-            result = main([str(input_path), str(output_path)])
+        df = run(args)
 
-            assert result == 0
-            assert output_path.exists()
+        assert output_path.exists()
+        assert df["RPM"].tolist() == [5000, 5500]
+
+    def test_options_build_config(self, monkeypatch):
+        """Test that CLI options are passed to the job as a DataCleaningConfig."""
+        calls = []
+        monkeypatch.setattr(
+            "data_cleaning.app.run_cleaning_job",
+            lambda *args, **kwargs: calls.append(kwargs),
+        )
+
+        result = main([
+            "input.csv", "output.csv",
+            "--rpm-max", "6000",
+            "--eff-min", "0",
+            "--eff-max", "100",
+            "--keep-multi-style-shifts",
+        ])
+
+        assert result == 0
+        assert calls[0]["config"] == DataCleaningConfig(
+            rpm_max=6000,
+            efficiency_min=0.0,
+            efficiency_max=100.0,
+            drop_multi_style_shifts=False,
+        )
 
     def test_with_custom_options(self, valid_raw_dataframe):
-        """Test CLI with custom options."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            input_path = Path(tmpdir) / "input.csv"
-            output_path = Path(tmpdir) / "output.csv"
-
-            valid_raw_dataframe.to_csv(input_path, index=False)
-
-            result = main([
-                str(input_path),
-                str(output_path),
-                "--rpm-max", "6000",
-                "--eff-min", "0",
-                "--eff-max", "100",
-            ])
-
-            assert result == 0
-            df_output = pd.read_csv(output_path)
-            assert (df_output["RPM"] <= 6000).all()
-
-    def test_with_format_override(self, valid_raw_dataframe):
+        """Test cleaning with the config built from custom CLI options."""
+        # --rpm-max 6000 --eff-min 0 --eff-max 100
+        cfg = DataCleaningConfig(rpm_max=6000, efficiency_min=0.0, efficiency_max=100.0)
+        df = DataCleaner(cfg).clean(valid_raw_dataframe)
+
+        assert len(df) == 3
+        assert (df["RPM"] <= 6000).all()
+
+    @pytest.mark.slow
+    def test_with_format_override(self, shared_input_csv, tmp_path):
         """Test CLI with format override."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            input_path = Path(tmpdir) / "input.data"
-            output_path = Path(tmpdir) / "output.out"
+        input_path = tmp_path / "input.data"
+        output_path = tmp_path / "output.out"
 
-            valid_raw_dataframe.to_csv(input_path, index=False)
+        shutil.copyfile(shared_input_csv, input_path)
 
-            result = main([
-                str(input_path),
-                str(output_path),
-                "--input-format", "csv",
-                "--output-format", "csv",
-            ])
+        result = main([
+            str(input_path),
+            str(output_path),
+            "--input-format", "csv",
+            "--output-format", "csv",
+        ])
 
-            assert result == 0
-            assert output_path.exists()
+        assert result == 0
+        assert output_path.exists()
 
     def test_keep_multi_style_shifts(self, valid_raw_dataframe):
-        """Test CLI with keep-multi-style-shifts option."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            input_path = Path(tmpdir) / "input.csv"
-            output_path = Path(tmpdir) / "output.csv"
+        """Test cleaning with the config built from --keep-multi-style-shifts."""
+        cfg = DataCleaningConfig(efficiency_min=0.0, drop_multi_style_shifts=False)
+        df = DataCleaner(cfg).clean(valid_raw_dataframe)
+
+        assert len(df) == len(valid_raw_dataframe)
+
+    def test_parquet_options_require_parquet_output(self):
+        """Test that Parquet options are rejected for other output formats."""
+        with pytest.raises(SystemExit):
+            main(["input.csv", "output.csv", "--parquet-compression", "snappy"])
 
-            valid_raw_dataframe.to_csv(input_path, index=False)
+    def test_cache_feather_rejects_streaming(self):
+        """Test that --cache-feather cannot be combined with --streaming."""
+        with pytest.raises(SystemExit):
+            main(["input.csv", "output.csv", "--cache-feather", "--streaming"])
 
-            result = main([
-                str(input_path),
-                str(output_path),
-                "--keep-multi-style-shifts",
-            ])
+    def test_streaming_rejects_excel_input(self):
+        """Test that --streaming only accepts formats that can be read in batches."""
+        with pytest.raises(SystemExit):
+            main(["input.xlsx", "output.csv", "--streaming"])
 
-            assert result == 0
-            assert output_path.exists()
+    def test_streaming_rejects_excel_output(self):
+        """Test that --streaming only writes formats that can be written in batches."""
+        with pytest.raises(SystemExit):
+            main(["input.csv", "output.xlsx", "--streaming"])
 
-    def test_missing_input_file_raises_error(self):
+    def test_missing_input_file_raises_error(self, tmp_path):
         """Test that missing input file raises an error."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            input_path = Path(tmpdir) / "nonexistent.csv"
-            output_path = Path(tmpdir) / "output.csv"
+        input_path = tmp_path / "nonexistent.csv"
+        output_path = tmp_path / "output.csv"
 
-            with pytest.raises(FileNotFoundError):
-                main([str(input_path), str(output_path)])
+        with pytest.raises(FileNotFoundError):
+            main([str(input_path), str(output_path)])
 
-    def test_invalid_columns_raises_error(self):
+    def test_invalid_columns_raises_error(self, tmp_path):
         """Test that invalid columns raise an error."""
         df_incomplete = pd.DataFrame({
             "Date": ["2024-01-01"],
             "Shift_period": ["Day"],
         })
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            input_path = Path(tmpdir) / "input.csv"
-            output_path = Path(tmpdir) / "output.csv"
+        input_path = tmp_path / "input.csv"
+        output_path = tmp_path / "output.csv"
 
-            df_incomplete.to_csv(input_path, index=False)
+        df_incomplete.to_csv(input_path, index=False)
 
-            with pytest.raises(KeyError, match="Missing required columns"):
-                main([str(input_path), str(output_path)])
+        with pytest.raises(KeyError, match="Missing required columns"):
+            main([str(input_path), str(output_path)])
 
 
 class TestCLIIntegration:
     """Integration tests for CLI."""
 
-    def test_full_pipeline_csv(self, valid_raw_dataframe):
+    @pytest.mark.slow
+    def test_full_pipeline_csv(self, shared_input_csv, tmp_path):
         """Test full pipeline with CSV files."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            input_path = Path(tmpdir) / "input.csv"
-            output_path = Path(tmpdir) / "output.csv"
+        output_path = tmp_path / "output.csv"
 
-            valid_raw_dataframe.to_csv(input_path, index=False)
+        result = main([str(shared_input_csv), str(output_path)])
 
-            result = main([str(input_path), str(output_path)])
+        assert result == 0
+        # Only the header is needed to check the columns
+        df_output = pd.read_csv(output_path, nrows=0)
 
-            assert result == 0
-            df_output = pd.read_csv(output_path)
+        # Check that derived columns are present
+        assert "Run_time_seconds" in df_output.columns
+        assert "Machine_Efficiency" in df_output.columns
 
-            # Check that derived columns are present
-            assert "Run_time_seconds" in df_output.columns
-            assert "Machine_Efficiency" in df_output.columns
+    @pytest.mark.slow
+    @pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow not installed")
+    def test_full_pipeline_streaming(self, shared_input_csv, tmp_path):
+        """Test full pipeline in streaming mode."""
+        output_path = tmp_path / "output.parquet"
 
+        result = main([str(shared_input_csv), str(output_path), "--streaming"])
+
+        assert result == 0
+        df_output = pd.read_parquet(output_path)
+        assert "Machine_Efficiency" in df_output.columns
+
+    @pytest.mark.slow
     @pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow or fastparquet not installed")
-    def test_full_pipeline_parquet(self, valid_raw_dataframe):
+    def test_full_pipeline_parquet(self, input_parquet, tmp_path):
         """Test full pipeline with Parquet files."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            input_path = Path(tmpdir) / "input.parquet"
-            output_path = Path(tmpdir) / "output.parquet"
-
-            valid_raw_dataframe.to_parquet(input_path, index=False)
+        output_path = tmp_path / "output.parquet"
 
-            result = main([str(input_path), str(output_path)])
+        result = main([str(input_parquet), str(output_path)])
 
-            assert result == 0
-            df_output = pd.read_parquet(output_path)
+        assert result == 0
+        df_output = pd.read_parquet(output_path)
 
-            assert "Run_time_seconds" in df_output.columns
-            assert "Machine_Efficiency" in df_output.columns
+        assert "Run_time_seconds" in df_output.columns
+        assert "Machine_Efficiency" in df_output.columns
@@ -31,6 +31,7 @@ class TestDataCleaningConfig:
         assert cfg.col_style == "Style-description"
         assert cfg.col_runtime == "Run_time"
         assert cfg.col_rpm == "RPM"
+        assert cfg.date_format is None
 
     def test_custom_values(self):
         """Test that custom values override defaults."""
@@ -60,6 +61,20 @@ class TestDataCleaningConfig:
             "Run\ntime": "Run_time",
         }
 
+    def test_output_columns(self):
+        """Test that output_columns is stored as a frozenset and validated."""
+        cfg = DataCleaningConfig(output_columns={"Machine_Efficiency"})  # type: ignore[arg-type]
+        assert cfg.output_columns == frozenset({"Machine_Efficiency"})
+        assert DataCleaningConfig().output_columns is None
+
+        with pytest.raises(ValueError, match="Unknown output columns"):
+            DataCleaningConfig(output_columns=frozenset({"Efficiency"}))
+
+    def test_hashable(self):
+        """Test that equal configs hash equally, so they can key caches."""
+        assert hash(DataCleaningConfig()) == hash(DataCleaningConfig())
+        assert DataCleaningConfig(rpm_max=9000) != DataCleaningConfig()
+
     def test_frozen_dataclass(self):
         """Test that the config is immutable (frozen)."""
         cfg = DataCleaningConfig()
@@ -2,24 +2,26 @@
 
 from __future__ import annotations
 
+import io
 import tempfile
+from importlib.util import find_spec
 from pathlib import Path
 
 import pandas as pd
 import pytest
 
-from data_cleaning.io import read_input_file, write_output_file
+from data_cleaning.io import (
+    BatchWriter,
+    csv_row_offsets,
+    iter_input_frames,
+    read_input_file,
+    read_input_rows,
+    write_output_file,
+)
 
-# Check if parquet is available
-try:
-    import pyarrow  # noqa: F401
-    HAS_PARQUET = True
-except ImportError:
-    try:
-        import fastparquet  # noqa: F401
-        HAS_PARQUET = True
-    except ImportError:
-        HAS_PARQUET = False
+# Check if parquet is available (without importing it)
+HAS_PARQUET = find_spec("pyarrow") is not None or find_spec("fastparquet") is not None
+HAS_EXCEL = find_spec("openpyxl") is not None
 
 
 @pytest.fixture
@@ -59,6 +61,44 @@ class TestReadInputFile:
         finally:
             temp_path.unlink()
 
+    def test_read_csv_without_pyarrow(self, sample_dataframe):
+        """Test that use_pyarrow=False falls back to the pandas reader."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+            sample_dataframe.to_csv(f.name, index=False)
+            temp_path = Path(f.name)
+
+        try:
+            df = read_input_file(temp_path, use_pyarrow=False)
+            pd.testing.assert_frame_equal(df, sample_dataframe)
+        finally:
+            temp_path.unlink()
+
+    def test_read_csv_keeps_run_time_as_text(self):
+        """Test that HH:MM:SS cells are not parsed into time-of-day objects."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+            f.write("Run_time,RPM\n06:00:00,5000\n07:30:00,6000\n")
+            temp_path = Path(f.name)
+
+        try:
+            df = read_input_file(temp_path)
+            assert df["Run_time"].tolist() == ["06:00:00", "07:30:00"]
+        finally:
+            temp_path.unlink()
+
+    def test_read_csv_keeps_dates_as_text(self):
+        """Test that date and timestamp cells are returned as written, like pd.read_csv."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+            f.write("Date,Stamp,RPM\n2024-01-01,2024-01-01T06:00:00,5000\n2024-01-02,2024-01-02 07:30:00,6000\n")
+            temp_path = Path(f.name)
+
+        try:
+            df = read_input_file(temp_path)
+            pd.testing.assert_frame_equal(df, pd.read_csv(temp_path))
+            assert df["Date"].tolist() == ["2024-01-01", "2024-01-02"]
+            assert df["Stamp"].tolist() == ["2024-01-01T06:00:00", "2024-01-02 07:30:00"]
+        finally:
+            temp_path.unlink()
+
     @pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow or fastparquet not installed")
     def test_read_parquet(self, sample_dataframe):
         """Test reading a Parquet file."""
@@ -72,6 +112,62 @@ class TestReadInputFile:
         finally:
             temp_path.unlink()
 
+    @pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow or fastparquet not installed")
+    def test_read_parquet_with_columns(self, sample_dataframe):
+        """Test that only the requested Parquet columns are loaded."""
+        with tempfile.NamedTemporaryFile(suffix=".parquet", delete=False) as f:
+            sample_dataframe.to_parquet(f.name, index=False)
+            temp_path = Path(f.name)
+
+        try:
+            df = read_input_file(temp_path, columns=["A", "C"])
+            pd.testing.assert_frame_equal(df, sample_dataframe[["A", "C"]])
+        finally:
+            temp_path.unlink()
+
+    @pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow not installed")
+    @pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+    def test_read_with_pyarrow_dtype_backend(self, sample_dataframe, suffix):
+        """Test that dtype_backend="pyarrow" returns Arrow-backed columns."""
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+            temp_path = Path(f.name)
+
+        try:
+            write_output_file(sample_dataframe, temp_path)
+            df = read_input_file(temp_path, dtype_backend="pyarrow")
+            assert all(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes)
+            assert df["B"].tolist() == ["x", "y", "z"]
+        finally:
+            temp_path.unlink()
+
+    @pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow not installed")
+    def test_read_feather(self, sample_dataframe):
+        """Test reading a (memory-mapped) Feather file."""
+        with tempfile.NamedTemporaryFile(suffix=".feather", delete=False) as f:
+            temp_path = Path(f.name)
+
+        try:
+            write_output_file(sample_dataframe, temp_path)
+            df = read_input_file(temp_path)
+            pd.testing.assert_frame_equal(df, sample_dataframe)
+            df = read_input_file(temp_path, columns=["A", "C"])
+            pd.testing.assert_frame_equal(df, sample_dataframe[["A", "C"]])
+        finally:
+            temp_path.unlink()
+
+    @pytest.mark.skipif(not HAS_EXCEL, reason="openpyxl not installed")
+    def test_read_xlsx(self, sample_dataframe):
+        """Test reading an Excel file."""
+        with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as f:
+            temp_path = Path(f.name)
+
+        try:
+            sample_dataframe.to_excel(temp_path, index=False)
+            df = read_input_file(temp_path)
+            pd.testing.assert_frame_equal(df, sample_dataframe)
+        finally:
+            temp_path.unlink()
+
     def test_unsupported_format_raises_error(self):
         """Test that unsupported format raises ValueError."""
         with tempfile.NamedTemporaryFile(suffix=".unsupported", delete=False) as f:
@@ -95,6 +191,159 @@ class TestReadInputFile:
         finally:
             Path(temp_path).unlink()
 
+    @pytest.mark.parametrize(
+        "fmt",
+        [
+            "csv",
+            pytest.param("parquet", marks=pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow not installed")),
+            pytest.param("feather", marks=pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow not installed")),
+            pytest.param("xlsx", marks=pytest.mark.skipif(not HAS_EXCEL, reason="openpyxl not installed")),
+        ],
+    )
+    def test_read_from_buffer(self, sample_dataframe, tmp_path, fmt):
+        """Test reading an in-memory file, which needs an explicit format."""
+        path = tmp_path / f"input.{fmt}"
+        write_output_file(sample_dataframe, path)
+
+        df = read_input_file(io.BytesIO(path.read_bytes()), fmt=fmt)
+        pd.testing.assert_frame_equal(df, sample_dataframe)
+
+        with pytest.raises(ValueError, match="`fmt` is required"):
+            read_input_file(io.BytesIO(path.read_bytes()))
+
+
+@pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow not installed")
+class TestIterInputFrames:
+    """Test cases for iter_input_frames function."""
+
+    @pytest.mark.parametrize("suffix", [".csv", ".parquet", ".feather"])
+    def test_batches_cover_file(self, sample_dataframe, suffix):
+        """Test that batches are bounded by batch_rows and cover every row."""
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+            temp_path = Path(f.name)
+
+        try:
+            write_output_file(sample_dataframe, temp_path)
+            frames = list(iter_input_frames(temp_path, batch_rows=2))
+            assert all(len(df) <= 2 for df in frames)
+            df = pd.concat(frames, ignore_index=True)
+            pd.testing.assert_frame_equal(df, sample_dataframe)
+        finally:
+            temp_path.unlink()
+
+    def test_unsupported_format_raises_error(self):
+        """Test that formats without batched reads raise ValueError."""
+        with pytest.raises(ValueError, match="Unsupported input format"):
+            next(iter_input_frames("data.xlsx"))
+
+
+@pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow not installed")
+class TestReadInputRows:
+    """Test cases for read_input_rows function."""
+
+    @pytest.mark.parametrize("suffix", [".csv", ".parquet", ".feather"])
+    def test_reads_row_range(self, suffix):
+        """Test that exactly the requested rows and columns are returned."""
+        df = pd.DataFrame({"A": range(10), "B": [f"r{i}" for i in range(10)]})
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+            temp_path = Path(f.name)
+
+        try:
+            options = {"row_group_size": 3} if suffix == ".parquet" else {}
+            write_output_file(df, temp_path, **options)
+
+            table = read_input_rows(temp_path, 4, 8)
+            assert table.to_pydict() == {"A": [4, 5, 6, 7], "B": ["r4", "r5", "r6", "r7"]}
+
+            table = read_input_rows(temp_path, 8, 20, columns=["B"])
+            assert table.to_pydict() == {"B": ["r8", "r9"]}
+
+            table = read_input_rows(temp_path, 20, 30)
+            assert table.num_rows == 0
+            assert table.column_names == ["A", "B"]
+        finally:
+            temp_path.unlink()
+
+    def test_csv_row_offsets(self, tmp_path):
+        """Test seeking to indexed CSV rows, including rows spanning lines."""
+        path = tmp_path / "input.csv"
+        notes = [f'line {i}\nwith "quotes"' if i % 7 == 0 else f"r{i}" for i in range(3000)]
+        df = pd.DataFrame({"A": range(3000), "B": notes})
+        df.to_csv(path, index=False)
+
+        offsets = csv_row_offsets(path, every=1024)
+        assert len(offsets) == 3
+        with open(path, "rb") as f:
+            f.seek(int(offsets[2]))
+            assert f.readline().startswith(b"2048,")
+
+        for start in (0, 1020, 2050, 2995):
+            table = read_input_rows(path, start, start + 10, row_offsets=offsets)
+            assert table.to_pydict() == {
+                "A": list(range(start, min(start + 10, 3000))),
+                "B": notes[start:start + 10],
+            }
+
+    def test_parquet_text_stays_dictionary_encoded(self, tmp_path):
+        """Test that Parquet text columns come back dictionary-encoded."""
+        pa = pytest.importorskip("pyarrow")
+        path = tmp_path / "input.parquet"
+        write_output_file(pd.DataFrame({"A": range(6), "B": ["x", "y"] * 3}), path)
+
+        table = read_input_rows(path, 1, 4)
+        assert pa.types.is_dictionary(table.schema.field("B").type)
+        assert not pa.types.is_dictionary(table.schema.field("A").type)
+        assert table.column("B").to_pylist() == ["y", "x", "y"]
+
+    def test_unsupported_format_raises_error(self):
+        """Test that formats without ranged reads raise ValueError."""
+        with pytest.raises(ValueError, match="Unsupported input format"):
+            read_input_rows("data.xlsx", 0, 10)
+
+
+@pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow not installed")
+class TestBatchWriter:
+    """Test cases for BatchWriter class."""
+
+    @pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+    def test_categorical_batches(self, suffix):
+        """Test batches whose categoricals need different dictionary index widths."""
+        small = pd.DataFrame({"A": pd.Categorical(["x", "y"])})
+        large = pd.DataFrame({"A": pd.Categorical([f"v{i}" for i in range(300)])})
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+            temp_path = Path(f.name)
+
+        try:
+            with BatchWriter(temp_path) as writer:
+                writer.write(small)
+                writer.write(large)
+            df = read_input_file(temp_path)
+            assert df["A"].astype(str).tolist() == ["x", "y", *large["A"].astype(str)]
+        finally:
+            temp_path.unlink()
+
+    def test_csv_batches_match_to_csv(self, tmp_path):
+        """Test that batches with and without text that needs quoting match DataFrame.to_csv."""
+        df = pd.DataFrame({
+            "Note": ["plain", 'said "hi", twice'],
+            "Flag": [True, False],
+            "Hours": [5000.0, 0.25],
+        })
+        output_path = tmp_path / "output.csv"
+        with BatchWriter(output_path) as writer:
+            writer.write(df.iloc[:1])
+            writer.write(df.iloc[1:])
+        assert output_path.read_text() == df.to_csv(index=False, lineterminator="\n")
+
+    def test_csv_batches_with_mixed_values(self, tmp_path):
+        """Test that a batch Arrow can't convert is written with to_csv."""
+        df = pd.DataFrame({"A": pd.Series([1, "x"], dtype=object), "B": [0.25, 1e-05]})
+        output_path = tmp_path / "output.csv"
+        with BatchWriter(output_path) as writer:
+            writer.write(df.iloc[:1].astype({"A": "int64"}))
+            writer.write(df.iloc[1:])
+        assert output_path.read_text() == df.to_csv(index=False, lineterminator="\n")
+
 
 class TestWriteOutputFile:
     """Test cases for write_output_file function."""
@@ -111,6 +360,56 @@ class TestWriteOutputFile:
         finally:
             temp_path.unlink()
 
+    def test_write_csv_matches_to_csv(self):
+        """Test that CSV output has the same layout as DataFrame.to_csv."""
+        df = pd.DataFrame({
+            "Date": pd.to_datetime(["2024-01-01", None]),
+            "Style": pd.Categorical(["Style A", None]),
+            "Flag": [True, False],
+            "Hours": [5000.0, 0.25],
+            "Note": ['said "hi", twice', "ok"],
+        })
+        with tempfile.TemporaryDirectory() as tmpdir:
+            expected, actual = Path(tmpdir) / "expected.csv", Path(tmpdir) / "actual.csv"
+            for frame in (df, df.drop(columns="Note")):
+                frame.to_csv(expected, index=False)
+                write_output_file(frame, actual)
+                # With and without text that needs quoting, the files are byte-identical.
+                assert actual.read_bytes() == expected.read_bytes()
+
+    @pytest.mark.parametrize(
+        "column",
+        [
+            pd.Series([1, "x", 2.5], dtype=object),
+            pd.to_timedelta(["06:00:00", "07:30:00", None]),
+            pd.Series([1e-05, 2.5e-07, 0.5]),
+            pd.Series([1.0000000000000005e15, 12345678901.0, 1e10 + 0.5]),
+            pd.to_datetime(["2024-01-01 06:00:00", "2024-01-02 00:00:00", None]).tz_localize("UTC"),
+            pd.to_datetime(["2024-01-01 06:00:00.123", "2024-01-02 00:00:00.000", None]),
+            pd.to_datetime(["2024-01-01 06:00:00", "2024-01-02 00:00:00", None]).astype("datetime64[ns]"),
+        ],
+        ids=["mixed", "timedelta", "small-float", "large-float", "tz-aware", "subsecond", "time-of-day"],
+    )
+    def test_write_csv_matches_to_csv_for_other_values(self, column, tmp_path):
+        """Test that values Arrow formats differently still come out as DataFrame.to_csv writes them."""
+        expected, actual = tmp_path / "expected.csv", tmp_path / "actual.csv"
+        for frame in (pd.DataFrame({"A": column}), pd.DataFrame({"A": column, "B": [1, 2, 3]})):
+            frame.to_csv(expected, index=False)
+            write_output_file(frame, actual)
+            assert actual.read_bytes() == expected.read_bytes()
+
+    def test_write_csv_arrow_backed_midnight_timestamps(self, tmp_path):
+        """Test that Arrow-backed timestamps keep their time, as DataFrame.to_csv writes them."""
+        pa = pytest.importorskip("pyarrow")
+        df = pd.DataFrame({
+            "Date": pd.Series(pd.to_datetime(["2024-01-01", "2024-01-02"])).astype(pd.ArrowDtype(pa.timestamp("us"))),
+            "RPM": [5000, 6000],
+        })
+        expected, actual = tmp_path / "expected.csv", tmp_path / "actual.csv"
+        df.to_csv(expected, index=False)
+        write_output_file(df, actual)
+        assert actual.read_bytes() == expected.read_bytes()
+
     def test_write_csv_with_format_override(self, sample_dataframe):
         """Test writing a file with format override."""
         with tempfile.NamedTemporaryFile(suffix=".data", delete=False) as f:
@@ -136,6 +435,26 @@ class TestWriteOutputFile:
         finally:
             temp_path.unlink()
 
+    @pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow not installed")
+    def test_write_parquet_defaults_to_zstd(self, sample_dataframe):
+        """Test that Parquet output is ZSTD-compressed unless overridden."""
+        import pyarrow.parquet as pq
+
+        with tempfile.NamedTemporaryFile(suffix=".parquet", delete=False) as f:
+            temp_path = Path(f.name)
+
+        try:
+            write_output_file(sample_dataframe, temp_path)
+            column = pq.ParquetFile(temp_path).metadata.row_group(0).column(0)
+            assert column.compression == "ZSTD"
+
+            write_output_file(sample_dataframe, temp_path, compression="snappy", row_group_size=2)
+            metadata = pq.ParquetFile(temp_path).metadata
+            assert metadata.row_group(0).column(0).compression == "SNAPPY"
+            assert metadata.num_row_groups == 2
+        finally:
+            temp_path.unlink()
+
     def test_write_with_index(self, sample_dataframe):
         """Test writing with index=True."""
         with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as f:
@@ -1,41 +1,229 @@
 """Flask application factory and main entry point."""
 
+import io
 import json
 import os
+import socket
 import sys
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from threading import Lock
+from urllib.parse import quote
 
-from flask import Flask, jsonify, request, send_file
+import numpy as np
+import orjson
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as pa_feather
+import pyarrow.parquet as pq
+from flask import Flask, Response, current_app, jsonify, request, send_file
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
 from flask_cors import CORS
+from sqlalchemy import event, inspect, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import selectinload
 
 # Add parent directory to path for data_cleaning import
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 
 from data_cleaning import DataCleaner, DataCleaningConfig, read_input_file, write_output_file
+from data_cleaning.io import csv_row_offsets, read_input_rows
 
 from config import config
 from models import DataFile, db
 
+# Formats whose pages are read straight from the file (parquet row groups,
+# memory-mapped feather); csv outputs use their row index, other files are
+# read whole and cached
+PAGED_FORMATS = {"parquet", "feather"}
+
+
+def file_disk_path(file: DataFile) -> Path:
+    """Where `file` is stored: the upload or output directory, by category."""
+    return current_app.extensions["file_dirs"][file.category] / file.stored_filename
+
+
+def row_index_path(path: Path) -> Path:
+    """Where the row offsets of csv file `path` are saved (`<name>.rows.npy`)."""
+    return path.with_name(path.name + ".rows.npy")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (NaN is written as null)."""
+    
+    def dumps(self, obj, **kwargs) -> str:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+class FileCache:
+    """
+    The last `maxsize` whole files read for paging, keyed by path, mtime and
+    size so a rewritten file is never served stale. Arrow tables where
+    possible, DataFrames for Excel data Arrow can't hold.
+    """
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple, pa.Table | pd.DataFrame] = OrderedDict()
+        self._lock = Lock()
+    
+    def get(self, path: Path, fmt: str, row_count: int) -> pa.Table | pd.DataFrame:
+        stat = path.stat()
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        
+        if fmt == "csv":
+            data = read_input_rows(path, 0, row_count, fmt=fmt)
+        else:
+            data = read_input_file(path, fmt=fmt)
+            try:
+                data = pa.Table.from_pandas(data, preserve_index=False)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                pass
+        
+        with self._lock:
+            self._entries[key] = data
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return data
+    
+    def evict(self, paths) -> None:
+        """Drop every cached version of `paths`."""
+        names = {str(path) for path in paths}
+        with self._lock:
+            for key in [key for key in self._entries if key[0] in names]:
+                del self._entries[key]
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    WAL lets readers run alongside a writer (e.g. listing files while a job
+    saves its result); NORMAL sync is safe with WAL and skips most fsyncs.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MB
+    cursor.close()
+
+
+def worker_id() -> str:
+    """Identifies this process on the jobs it runs (`<host>:<pid>`)."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def worker_alive(worker: str | None) -> bool:
+    """Whether the process `worker` (see worker_id) may still be running its jobs."""
+    if worker is None:
+        # Recorded before jobs were tagged with their process
+        return False
+    host, _, pid = worker.rpartition(":")
+    if host != socket.gethostname():
+        # Another machine's process can't be checked from here
+        return True
+    if int(pid) == os.getpid():
+        return True
+    if os.name != "posix":
+        # os.kill would terminate the process here; the backend runs as a
+        # single process on Windows (the desktop app), so other ones are gone
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def fail_orphaned_jobs() -> None:
+    """
+    Mark jobs as failed whose process has exited (e.g. a restart) before they
+    finished. Jobs run in their process's executor, so nothing else will
+    finish them; jobs of other live processes (gunicorn workers, the
+    reloader's parent) are left alone.
+    """
+    orphaned = [
+        file.id
+        for file in DataFile.query.filter_by(status="processing")
+        if not worker_alive(file.worker)
+    ]
+    if orphaned:
+        DataFile.query.filter(DataFile.id.in_(orphaned)).update({
+            "status": "failed",
+            "error_message": "Processing was interrupted by a server restart",
+        }, synchronize_session=False)
+        db.session.commit()
+
 
 def create_app(config_name: str = "default") -> Flask:
     """Create and configure the Flask application."""
     
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     app.config.from_object(config[config_name])
     
+    # Parquet/Feather/CSV reads decode columns and row groups on these pools
+    pa.set_cpu_count(app.config["ARROW_CPU_COUNT"])
+    pa.set_io_thread_count(app.config["ARROW_IO_THREADS"])
+    
     # Initialize extensions - allow all origins in development
     CORS(app, resources={r"/api/*": {"origins": "*"}}, supports_credentials=True)
+    Compress(app)
     db.init_app(app)
     
+    app.extensions["file_cache"] = FileCache(app.config["FILE_CACHE_SIZE"])
+    
+    # Cleaning jobs run here so requests return immediately
+    app.extensions["job_executor"] = ThreadPoolExecutor(
+        max_workers=app.config["PROCESSING_WORKERS"], thread_name_prefix="cleaning-job"
+    )
+    
     # Ensure directories exist
-    Path(app.config["UPLOAD_FOLDER"]).mkdir(parents=True, exist_ok=True)
-    Path(app.config["OUTPUT_FOLDER"]).mkdir(parents=True, exist_ok=True)
+    # Storage directory per file category, resolved once
+    app.extensions["file_dirs"] = {
+        "input": Path(app.config["UPLOAD_FOLDER"]).resolve(),
+        "output": Path(app.config["OUTPUT_FOLDER"]).resolve(),
+    }
+    for directory in app.extensions["file_dirs"].values():
+        directory.mkdir(parents=True, exist_ok=True)
     
-    # Create database tables
+    # Create database tables, and the indexes and columns missing from
+    # databases created before they were added
     with app.app_context():
+        if db.engine.dialect.name == "sqlite":
+            event.listen(db.engine, "connect", set_sqlite_pragmas)
         db.create_all()
+        for index in DataFile.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
+        columns = {column["name"] for column in inspect(db.engine).get_columns(DataFile.__tablename__)}
+        if "worker" not in columns:
+            try:
+                with db.engine.begin() as connection:
+                    connection.execute(text(f"ALTER TABLE {DataFile.__tablename__} ADD COLUMN worker VARCHAR(255)"))
+            except DBAPIError:
+                # Added by another worker starting at the same time
+                pass
+        
+        fail_orphaned_jobs()
     
     # Register routes
     register_routes(app)
@@ -48,6 +236,77 @@ def allowed_file(filename: str, allowed_extensions: set) -> bool:
     return "." in filename and filename.rsplit(".", 1)[1].lower() in allowed_extensions
 
 
+def table_records(table: pa.Table) -> list[dict]:
+    """
+    Rows of an Arrow table as JSON-ready dicts: NaN becomes null, dates and
+    timestamps ISO strings with millisecond precision (as `to_json` wrote
+    them), times ISO strings.
+    """
+    for i, field in enumerate(table.schema):
+        col = table.column(i)
+        typ = field.type
+        if pa.types.is_dictionary(typ):
+            col = col.cast(typ.value_type)
+            typ = typ.value_type
+        if pa.types.is_floating(typ):
+            col = pc.if_else(pc.is_nan(col), pa.scalar(None, typ), col)
+        elif pa.types.is_timestamp(typ) or pa.types.is_date(typ):
+            ms = pa.timestamp("ms", getattr(typ, "tz", None))
+            col = pc.strftime(col.cast(ms, safe=False), "%Y-%m-%dT%H:%M:%S")
+        elif pa.types.is_time(typ):
+            col = col.cast(pa.string())
+        elif pa.types.is_duration(typ):
+            col = col.cast(pa.duration("ms"), safe=False).cast(pa.int64())
+        else:
+            continue
+        table = table.set_column(i, field.name, col)
+    return table.to_pylist()
+
+
+def frame_records(df: pd.DataFrame) -> list[dict]:
+    """Rows of a DataFrame as JSON-ready dicts (see `table_records`)."""
+    try:
+        return table_records(pa.Table.from_pandas(df, preserve_index=False))
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed-type object columns (e.g. from Excel) can't become Arrow;
+        # let pandas encode those pages
+        return orjson.loads(df.to_json(orient="records", date_format="iso"))
+
+
+def parquet_summary(source) -> tuple[int, list[str]]:
+    """Row count and column names of a Parquet file, from its footer alone."""
+    parquet_file = pq.ParquetFile(source)
+    schema = parquet_file.schema_arrow
+    # Index columns written by pandas are not data columns
+    pandas_metadata = schema.pandas_metadata or {}
+    index_columns = {c for c in pandas_metadata.get("index_columns", []) if isinstance(c, str)}
+    return parquet_file.metadata.num_rows, [n for n in schema.names if n not in index_columns]
+
+
+def store_feather_copy(df: pd.DataFrame, upload_path: Path) -> str:
+    """
+    Write `df` next to the upload as uncompressed `<name>.feather`, which is
+    memory-mapped when pages are read, and return that file's name. Text
+    columns with at most half as many distinct values as rows are stored
+    dictionary-encoded. Frames Arrow can't represent (e.g. mixed-type Excel
+    columns) are not converted; the upload's name is returned.
+    """
+    feather_path = upload_path.with_suffix(".feather")
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        for i, field in enumerate(table.schema):
+            col = table.column(i)
+            is_text = pa.types.is_string(field.type) or pa.types.is_large_string(field.type)
+            if is_text and pc.count_distinct(col).as_py() <= len(col) // 2:
+                # One dictionary for the whole column; IPC files can't replace it per chunk
+                table = table.set_column(i, field.name, col.combine_chunks().dictionary_encode())
+        pa_feather.write_feather(table, feather_path, compression="uncompressed")
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        feather_path.unlink(missing_ok=True)
+        return upload_path.name
+    return feather_path.name
+
+
 def register_routes(app: Flask) -> None:
     """Register all application routes."""
     
@@ -81,37 +340,67 @@ def register_routes(app: Flask) -> None:
         file = DataFile.query.get_or_404(file_id)
         
         # Determine file path
-        if file.category == "input":
-            file_path = Path(app.config["UPLOAD_FOLDER"]) / file.stored_filename
-        else:
-            file_path = Path(app.config["OUTPUT_FOLDER"]) / file.stored_filename
+        file_path = file_disk_path(file)
+        
+        if file.status != "completed":
+            return jsonify({"error": f"File is {file.status}"}), 409
         
         if not file_path.exists():
             return jsonify({"error": "File not found on disk"}), 404
         
         try:
-            # Read file
-            df = read_input_file(file_path)
-            
             # Pagination
             page = request.args.get("page", 1, type=int)
             per_page = request.args.get("per_page", 50, type=int)
             per_page = min(per_page, 500)  # Max 500 rows per page
             
-            total_rows = len(df)
+            # Row count and columns were recorded on upload/processing
+            total_rows = file.row_count
+            columns = json.loads(file.columns_json)
+            
+            # Optional column projection (?columns=A&columns=B)
+            selected = request.args.getlist("columns")
+            if selected:
+                unknown = [c for c in selected if c not in columns]
+                if unknown:
+                    return jsonify({"error": f"Unknown columns: {', '.join(unknown)}"}), 400
+                columns = selected
+            
             total_pages = (total_rows + per_page - 1) // per_page
+            stored_format = file_path.suffix.lstrip(".")
             
             start_idx = (page - 1) * per_page
             end_idx = start_idx + per_page
             
-            # Get page data
-            page_df = df.iloc[start_idx:end_idx]
-            
-            # Convert to records, handling NaN values
-            records = json.loads(page_df.to_json(orient="records", date_format="iso"))
+            if start_idx >= total_rows:
+                records = []
+            elif stored_format in PAGED_FORMATS:
+                # Decode only the page's rows
+                table = read_input_rows(
+                    file_path, start_idx, end_idx, fmt=stored_format, columns=columns
+                )
+                records = table_records(table)
+            elif stored_format == "csv" and row_index_path(file_path).exists():
+                # Parse from the indexed row nearest the page
+                table = read_input_rows(
+                    file_path,
+                    start_idx,
+                    end_idx,
+                    fmt="csv",
+                    columns=columns,
+                    row_offsets=np.load(row_index_path(file_path)),
+                )
+                records = table_records(table)
+            else:
+                # csv/Excel: parsed once, then pages are sliced from memory
+                data = app.extensions["file_cache"].get(file_path, stored_format, total_rows)
+                if isinstance(data, pa.Table):
+                    records = table_records(data.select(columns).slice(start_idx, per_page))
+                else:
+                    records = frame_records(data.iloc[start_idx:end_idx][columns])
             
             return jsonify({
-                "columns": list(df.columns),
+                "columns": columns,
                 "data": records,
                 "pagination": {
                     "page": page,
@@ -128,43 +417,62 @@ def register_routes(app: Flask) -> None:
         """Download a file."""
         file = DataFile.query.get_or_404(file_id)
         
-        if file.category == "input":
-            file_path = Path(app.config["UPLOAD_FOLDER"]) / file.stored_filename
-        else:
-            file_path = Path(app.config["OUTPUT_FOLDER"]) / file.stored_filename
+        file_path = file_disk_path(file)
+        
+        # csv/Excel inputs are stored as Feather; the upload is kept under the
+        # same name with its own extension
+        file_path = file_path.with_suffix(f".{file.file_type}")
         
         if not file_path.exists():
             return jsonify({"error": "File not found"}), 404
         
+        accel_prefix = app.config.get("X_ACCEL_REDIRECT_PREFIX")
+        if accel_prefix:
+            # nginx sends the file itself
+            response = Response(mimetype="application/octet-stream")
+            response.headers["X-Accel-Redirect"] = f"{accel_prefix}{file_path.parent.name}/{file_path.name}"
+            name = file.original_filename
+            response.headers.set(
+                "Content-Disposition",
+                "attachment",
+                filename=name.encode("ascii", "replace").decode(),
+                **{"filename*": f"UTF-8''{quote(name)}"},
+            )
+            return response
+        
+        # Served through the WSGI file wrapper (sendfile where the server
+        # supports it), with ETag / Last-Modified for conditional and range requests
         return send_file(
             file_path,
             as_attachment=True,
             download_name=file.original_filename,
+            conditional=True,
+            etag=True,
+            last_modified=file_path.stat().st_mtime,
         )
     
     @app.route("/api/files/<int:file_id>", methods=["DELETE"])
     def delete_file(file_id: int):
         """Delete a file."""
-        file = DataFile.query.get_or_404(file_id)
-        
-        # Delete physical file
-        if file.category == "input":
-            file_path = Path(app.config["UPLOAD_FOLDER"]) / file.stored_filename
-        else:
-            file_path = Path(app.config["OUTPUT_FOLDER"]) / file.stored_filename
+        # Outputs are deleted with the file (cascade). They, and the outputs
+        # the cascade checks them for, are loaded with one query per level
+        file = DataFile.query.options(
+            selectinload(DataFile.outputs).selectinload(DataFile.outputs)
+        ).get_or_404(file_id)
         
-        if file_path.exists():
-            file_path.unlink()
+        file_path = file_disk_path(file)
         
-        # Delete associated output files
-        for output in file.outputs:
-            output_path = Path(app.config["OUTPUT_FOLDER"]) / output.stored_filename
-            if output_path.exists():
-                output_path.unlink()
-            db.session.delete(output)
+        paths = {file_path, file_path.with_suffix(f".{file.file_type}")}
+        paths.update(file_disk_path(output) for output in file.outputs)
+        paths.update([row_index_path(path) for path in paths])
         
         db.session.delete(file)
         db.session.commit()
+        app.extensions["file_cache"].evict(paths)
+        
+        # Delete physical files once the records are gone, overlapping the unlinks
+        with ThreadPoolExecutor(max_workers=min(8, len(paths))) as pool:
+            list(pool.map(lambda path: path.unlink(missing_ok=True), paths))
         
         return jsonify({"message": "File deleted successfully"})
     
@@ -192,20 +500,29 @@ def register_routes(app: Flask) -> None:
         file_ext = original_filename.rsplit(".", 1)[1].lower()
         stored_filename = f"{uuid.uuid4().hex}.{file_ext}"
         
-        # Save file
-        upload_path = Path(app.config["UPLOAD_FOLDER"]) / stored_filename
-        file.save(upload_path)
+        # Save file; the bytes stay in memory (MAX_CONTENT_LENGTH bounds them)
+        # so the file is parsed without reading it back from disk
+        upload_path = app.extensions["file_dirs"]["input"] / stored_filename
+        data = file.read()
+        upload_path.write_bytes(data)
         
         # Get file info
-        file_size = upload_path.stat().st_size
+        file_size = len(data)
         
         try:
             # Read file to get metadata
             print(f"Reading file from: {upload_path}")
-            df = read_input_file(upload_path)
-            row_count = len(df)
-            column_count = len(df.columns)
-            columns_json = json.dumps(list(df.columns))
+            if file_ext == "parquet":
+                # Already columnar and paged by row group; only the footer is read
+                row_count, columns = parquet_summary(pa.BufferReader(data))
+            else:
+                df = read_input_file(io.BytesIO(data), fmt=file_ext)
+                row_count, columns = len(df), list(df.columns)
+                
+                # Keep a Feather copy so later reads skip parsing the upload
+                stored_filename = store_feather_copy(df, upload_path)
+            column_count = len(columns)
+            columns_json = json.dumps(columns)
             print(f"File read successfully: {row_count} rows, {column_count} columns")
         except Exception as e:
             # Remove file if we can't read it
@@ -254,56 +571,103 @@ def register_routes(app: Flask) -> None:
             drop_multi_style_shifts=config_data.get("drop_multi_style_shifts", True),
         )
         
-        # Read input file
-        input_path = Path(app.config["UPLOAD_FOLDER"]) / input_file.stored_filename
+        # Record the output up front; its status tracks the background job
+        output_ext = config_data.get("output_format", input_file.file_type)
+        output_file = DataFile(
+            original_filename=f"cleaned_{input_file.original_filename.rsplit('.', 1)[0]}.{output_ext}",
+            stored_filename=f"{uuid.uuid4().hex}.{output_ext}",
+            file_type=output_ext,
+            file_size=0,
+            category="output",
+            parent_id=input_file.id,
+            config_json=json.dumps(config_data),
+            status="processing",
+            worker=worker_id(),
+        )
+        
+        db.session.add(output_file)
+        db.session.commit()
+        
+        app.extensions["job_executor"].submit(
+            run_processing_job, app, output_file.id, cleaning_config
+        )
+        
+        return jsonify({
+            "message": "Processing started",
+            "job_id": output_file.id,
+            "input_file": input_file.to_dict(),
+            "output_file": output_file.to_dict(),
+        }), 202
+    
+    @app.route("/api/jobs/<int:job_id>", methods=["GET"])
+    def get_job(job_id: int):
+        """Poll a processing job (the id of the output file it writes)."""
+        output_file = DataFile.query.get_or_404(job_id)
+        
+        if output_file.category != "output":
+            return jsonify({"error": "Not a processing job"}), 404
         
+        result = {
+            "job_id": output_file.id,
+            "status": output_file.status,
+            "error": output_file.error_message,
+            "input_file": output_file.parent.to_dict() if output_file.parent else None,
+            "output_file": output_file.to_dict(),
+        }
+        if output_file.status == "completed" and output_file.parent:
+            input_rows = output_file.parent.row_count
+            result["stats"] = {
+                "input_rows": input_rows,
+                "output_rows": output_file.row_count,
+                "rows_removed": input_rows - output_file.row_count,
+            }
+        
+        return jsonify(result)
+
+
+def run_processing_job(app: Flask, output_id: int, cleaning_config: DataCleaningConfig) -> None:
+    """Read, clean and write the input of output file `output_id`, recording the outcome."""
+    with app.app_context():
+        output_path = None
         try:
+            output_file = db.session.get(DataFile, output_id)
+            if output_file is None:
+                # Deleted, along with its input, before the job started
+                return
+            if output_file.parent is None:
+                raise FileNotFoundError("The input file has been deleted")
+            input_path = file_disk_path(output_file.parent)
+            output_path = file_disk_path(output_file)
+            
             df_raw = read_input_file(input_path)
             
             # Clean data
             cleaner = DataCleaner(config=cleaning_config)
             df_clean = cleaner.clean(df_raw)
             
-            # Generate output filename
-            output_ext = config_data.get("output_format", input_file.file_type)
-            output_stored_filename = f"{uuid.uuid4().hex}.{output_ext}"
-            output_path = Path(app.config["OUTPUT_FOLDER"]) / output_stored_filename
-            
             # Write output file
             write_output_file(df_clean, output_path)
+            if output_path.suffix == ".csv":
+                np.save(row_index_path(output_path), csv_row_offsets(output_path))
             
-            # Create output file record
-            output_file = DataFile(
-                original_filename=f"cleaned_{input_file.original_filename.rsplit('.', 1)[0]}.{output_ext}",
-                stored_filename=output_stored_filename,
-                file_type=output_ext,
-                file_size=output_path.stat().st_size,
-                category="output",
-                parent_id=input_file.id,
-                config_json=json.dumps(config_data),
-                row_count=len(df_clean),
-                column_count=len(df_clean.columns),
-                columns_json=json.dumps(list(df_clean.columns)),
-                status="completed",
-                processed_at=datetime.utcnow(),
-            )
-            
-            db.session.add(output_file)
+            output_file.file_size = output_path.stat().st_size
+            output_file.row_count = len(df_clean)
+            output_file.column_count = len(df_clean.columns)
+            output_file.columns_json = json.dumps(list(df_clean.columns))
+            output_file.status = "completed"
+            output_file.processed_at = datetime.utcnow()
             db.session.commit()
-            
-            return jsonify({
-                "message": "File processed successfully",
-                "input_file": input_file.to_dict(),
-                "output_file": output_file.to_dict(),
-                "stats": {
-                    "input_rows": len(df_raw),
-                    "output_rows": len(df_clean),
-                    "rows_removed": len(df_raw) - len(df_clean),
-                },
-            })
-            
         except Exception as e:
-            return jsonify({"error": str(e)}), 500
+            db.session.rollback()
+            if output_path is not None:
+                output_path.unlink(missing_ok=True)
+                row_index_path(output_path).unlink(missing_ok=True)
+            DataFile.query.filter_by(id=output_id).update({
+                "status": "failed",
+                "error_message": str(e),
+                "processed_at": datetime.utcnow(),
+            })
+            db.session.commit()
 
 
 # Create app instance
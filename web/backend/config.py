@@ -5,6 +5,9 @@ from pathlib import Path
 
 BASE_DIR = Path(__file__).parent.absolute()
 
+# CPUs this process may run on (respects affinity/container limits on Linux)
+CPU_COUNT = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
 
 class Config:
     """Base configuration."""
@@ -20,6 +23,27 @@ class Config:
     OUTPUT_FOLDER = BASE_DIR / "outputs"
     MAX_CONTENT_LENGTH = 50 * 1024 * 1024  # 50 MB max file size
     ALLOWED_EXTENSIONS = {"csv", "xlsx", "xls", "parquet"}
+    
+    # JSON responses are compressed (Flask-Compress) for clients that accept it;
+    # file downloads are sent as they are
+    COMPRESS_MIMETYPES = ["application/json"]
+    COMPRESS_LEVEL = 4
+    COMPRESS_BR_LEVEL = 4
+    
+    # Recently paged csv/Excel files kept parsed in memory
+    FILE_CACHE_SIZE = int(os.environ.get("FILE_CACHE_SIZE", 8))
+    
+    # Background threads that run cleaning jobs
+    PROCESSING_WORKERS = int(os.environ.get("PROCESSING_WORKERS", min(4, CPU_COUNT)))
+    
+    # pyarrow's decode thread pool and its I/O thread pool
+    ARROW_CPU_COUNT = int(os.environ.get("ARROW_CPU_COUNT", CPU_COUNT))
+    ARROW_IO_THREADS = int(os.environ.get("ARROW_IO_THREADS", min(8, CPU_COUNT)))
+    
+    # Behind nginx, downloads are handed off with X-Accel-Redirect to
+    # <prefix>uploads/<name> or <prefix>outputs/<name>, e.g. "/internal/"
+    # for an internal location aliased to this directory
+    X_ACCEL_REDIRECT_PREFIX = os.environ.get("X_ACCEL_REDIRECT_PREFIX")
 
 
 class DevelopmentConfig(Config):
@@ -3,13 +3,19 @@
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
 
-db = SQLAlchemy()
+# Records are serialized right after commit (e.g. to_dict() in responses);
+# keeping their loaded state avoids a SELECT per object to refresh it
+db = SQLAlchemy(session_options={"expire_on_commit": False})
 
 
 class DataFile(db.Model):
     """Model for storing uploaded and processed files."""
     
     __tablename__ = "data_files"
+    __table_args__ = (
+        # list_files: filter by category, newest first
+        db.Index("ix_data_files_category_created_at", "category", "created_at"),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     
@@ -23,8 +29,12 @@ class DataFile(db.Model):
     category = db.Column(db.String(20), nullable=False)  # 'input' or 'output'
     
     # Relationship to parent (for output files)
-    parent_id = db.Column(db.Integer, db.ForeignKey("data_files.id"), nullable=True)
-    parent = db.relationship("DataFile", remote_side=[id], backref="outputs")
+    parent_id = db.Column(db.Integer, db.ForeignKey("data_files.id"), nullable=True, index=True)
+    parent = db.relationship(
+        "DataFile",
+        remote_side=[id],
+        backref=db.backref("outputs", cascade="all, delete-orphan"),
+    )
     
     # Processing configuration (JSON stored as string)
     config_json = db.Column(db.Text, nullable=True)
@@ -36,10 +46,11 @@ class DataFile(db.Model):
     
     # Processing status
     status = db.Column(db.String(20), default="pending")  # pending, processing, completed, failed
+    worker = db.Column(db.String(255), nullable=True)  # "<host>:<pid>" of the process running the job
     error_message = db.Column(db.Text, nullable=True)
     
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     processed_at = db.Column(db.DateTime, nullable=True)
     
     def to_dict(self):
@@ -58,6 +69,8 @@ class DataFile(db.Model):
             "columns_json": self.columns_json,
             "status": self.status,
             "error_message": self.error_message,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "processed_at": self.processed_at.isoformat() if self.processed_at else None,
+            # Serialized as ISO 8601 by the app's orjson provider, without a
+            # Python-level isoformat() call per row
+            "created_at": self.created_at,
+            "processed_at": self.processed_at,
         }
@@ -44,6 +44,15 @@ export interface ProcessResult {
   }
 }
 
+export interface ProcessJob {
+  job_id: number
+  status: 'processing' | 'completed' | 'failed'
+  error: string | null
+  input_file: DataFile | null
+  output_file: DataFile
+  stats?: ProcessResult['stats']
+}
+
 export interface FileDataResponse {
   columns: string[]
   data: Record<string, unknown>[]
@@ -55,6 +64,11 @@ export interface FileDataResponse {
   }
 }
 
+const getJob = async (jobId: number): Promise<ProcessJob> => {
+  const response = await axios.get(`${API_BASE}/jobs/${jobId}`)
+  return response.data
+}
+
 export const api = {
   // Health check
   healthCheck: async () => {
@@ -89,11 +103,27 @@ export const api = {
     return response.data.file
   },
 
-  processFile: async (fileId: number, config: CleaningConfig): Promise<ProcessResult> => {
+  // Starts a background cleaning job and polls it until it finishes
+  processFile: async (fileId: number, config: CleaningConfig, pollMs = 500): Promise<ProcessResult> => {
     const response = await axios.post(`${API_BASE}/process/${fileId}`, config)
-    return response.data
+    let job: ProcessJob = { ...response.data, status: 'processing', error: null }
+    while (job.status === 'processing') {
+      await new Promise((resolve) => setTimeout(resolve, pollMs))
+      job = await getJob(job.job_id)
+    }
+    if (job.status === 'failed') {
+      throw new Error(job.error || 'Processing failed')
+    }
+    return {
+      message: 'File processed successfully',
+      input_file: job.input_file as DataFile,
+      output_file: job.output_file,
+      stats: job.stats as ProcessResult['stats'],
+    }
   },
 
+  getJob,
+
   deleteFile: async (fileId: number): Promise<void> => {
     await axios.delete(`${API_BASE}/files/${fileId}`)
   },